@@ -1,15 +1,71 @@
 # Django Imports
 from django.contrib import admin
+from django.db.models import Q
 
 # Own Imports
-from books.models import Book, Author
+from books.models import Book, Author, Job
+from books.filters import PREFIX_END
+from books.paginators import EstimatedCountPaginator
 
 
 @admin.register(Book)
 class BookAdmin(admin.ModelAdmin):
     list_display = ["id", "name", "isbn", "author"]
+    list_select_related = ["author"]
+    raw_id_fields = ["author"]
+    search_fields = ["name", "isbn"]
+    search_help_text = "Search by name prefix or exact ISBN"
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    
+    def get_search_results(self, request, queryset, search_term):
+        # match on the indexed columns only: name by prefix range, isbn exactly
+        if not search_term:
+            return queryset, False
+        
+        queryset = queryset.filter(
+            Q(name__gte=search_term, name__lt=search_term + PREFIX_END)
+            | Q(isbn=search_term)
+        )
+        return queryset, False
+    
+    # deletes are soft, the archive_deleted job moves the rows out later
+    def delete_model(self, request, obj):
+        Book.objects.filter(id=obj.id).soft_delete()
+    
+    def delete_queryset(self, request, queryset):
+        queryset.soft_delete()
     
 
 @admin.register(Author)
 class AuthorAdmin(admin.ModelAdmin):
-    list_display = ["id", "first_name", "last_name"]
\ No newline at end of file
+    list_display = ["id", "first_name", "last_name"]
+    search_fields = ["last_name"]
+    search_help_text = "Search by last name prefix"
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    
+    def get_search_results(self, request, queryset, search_term):
+        # match on the indexed last_name column by prefix range
+        if not search_term:
+            return queryset, False
+        
+        queryset = queryset.filter(
+            last_name__gte=search_term, last_name__lt=search_term + PREFIX_END
+        )
+        return queryset, False
+    
+    # deletes are soft and include the books of the authors
+    def delete_model(self, request, obj):
+        Author.objects.filter(id=obj.id).soft_delete()
+    
+    def delete_queryset(self, request, queryset):
+        queryset.soft_delete()
+
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ["id", "name", "status", "progress", "attempts", "run_after", "updated_at"]
+    list_filter = ["status", "name"]
+    readonly_fields = ["created_at", "updated_at"]
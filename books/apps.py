@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class BooksConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "books"
+    
+    def ready(self):
+        # registers the book_count maintenance receivers
+        from books import signals  # noqa: F401
@@ -0,0 +1,215 @@
+# Native Imports
+import threading
+import unicodedata
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional, Tuple
+
+# Django Imports
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q, QuerySet
+
+# Own Imports
+from books.cache import AUTHOR_NAMES, bump_version, current_version
+from books.filters import PREFIX_END
+from books.models import Author
+
+
+def normalize(value:str) -> str:
+    """
+    This function folds a name for prefix matching: accents are stripped,
+    case is folded and runs of whitespace collapse into one space
+    """
+    value = unicodedata.normalize("NFKD", value)
+    value = "".join(char for char in value if not unicodedata.combining(char))
+    return " ".join(value.casefold().split())
+
+
+def index_keys(first_name:str, last_name:str) -> set:
+    # an author is found by either name or the full name
+    keys = {normalize(first_name), normalize(last_name), normalize(f"{first_name} {last_name}")}
+    keys.discard("")
+    return keys
+
+
+class AuthorIndex:
+    """
+    In-process prefix index over the author names, a sorted list of
+    ``(normalized name, author id)`` entries searched with bisection.
+
+    Each worker builds it on first use from a single query and keeps it in
+    step with the author saves and deletes it handles itself through
+    books.signals. It is rebuilt when the author names version moves
+    because another worker wrote, and disabled while the table has more
+    than ``AUTOCOMPLETE_INDEX_MAX_AUTHORS`` authors.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.building = threading.Lock()
+        self.entries: List[Tuple[str, int]] = []
+        self.authors: Dict[int, Tuple[str, str]] = {}
+        self.version: Optional[str] = None
+        self.enabled = False
+
+    def build(self, version:str) -> None:
+        limit = settings.AUTOCOMPLETE_INDEX_MAX_AUTHORS
+
+        if self.version is not None and not self.enabled:
+            # still too large: probe the primary key index instead of loading the table
+            if Author.objects.values("id")[limit:limit + 1].exists():
+                self.version = version
+                return
+
+        rows = list(Author.objects.values_list("id", "first_name", "last_name")[:limit + 1])
+
+        if len(rows) > limit:
+            authors, entries = {}, []
+        else:
+            authors = {author_id: (first_name, last_name) for author_id, first_name, last_name in rows}
+            entries = sorted(
+                (key, author_id)
+                for author_id, (first_name, last_name) in authors.items()
+                for key in index_keys(first_name, last_name)
+            )
+
+        with self.lock:
+            self.authors, self.entries = authors, entries
+            self.enabled = len(rows) <= limit
+            self.version = version
+
+    def is_current(self) -> bool:
+        """
+        This method brings the index up to date with the author names version,
+        rebuilding it if needed. Requests arriving while another thread rebuilds
+        it get False and fall back to the database instead of waiting
+
+        :return: Whether the index can serve searches.
+        """
+        version = current_version(AUTHOR_NAMES)
+        if self.version == version:
+            return self.enabled
+
+        if not self.building.acquire(blocking=False):
+            return False
+        try:
+            if self.version != version:
+                self.build(version)
+        finally:
+            self.building.release()
+        return self.enabled
+
+    def search(self, query:str, limit:int) -> List[dict]:
+        """
+        This method returns the first authors, in name order, with a name
+        or full name starting with the query
+
+        :param query: The typed prefix
+        :type query: str
+        :param limit: The maximum number of authors returned
+        :type limit: int
+        :return: A list of authors with their id, first_name and last_name.
+        """
+        prefix = normalize(query)
+        results, seen = [], set()
+
+        with self.lock:
+            position = bisect_left(self.entries, (prefix,))
+
+            while position < len(self.entries) and len(results) < limit:
+                key, author_id = self.entries[position]
+                if not key.startswith(prefix):
+                    break
+
+                if author_id not in seen:
+                    seen.add(author_id)
+                    first_name, last_name = self.authors[author_id]
+                    results.append({"id": author_id, "first_name": first_name, "last_name": last_name})
+                position += 1
+
+        return results
+
+    def discard(self, author_id:int) -> None:
+        # callers hold the lock
+        names = self.authors.pop(author_id, None)
+        if names is None:
+            return
+
+        for key in index_keys(*names):
+            position = bisect_left(self.entries, (key, author_id))
+            if position < len(self.entries) and self.entries[position] == (key, author_id):
+                del self.entries[position]
+
+    def update(self, author:Author, deleted:bool = False) -> None:
+        """
+        This method applies an author save or delete handled by this worker
+        and bumps the author names version for the other workers. The index
+        takes the new version on commit, so the write costs this worker no
+        rebuild, unless it was already behind another worker's writes
+
+        :param author: The saved or deleted author
+        :type author: Author
+        :param deleted: Whether the author was deleted
+        :type deleted: bool
+        """
+        deleted = deleted or author.deleted_at is not None
+        version = self.version
+        was_current = self.enabled and version == current_version(AUTHOR_NAMES)
+        bump_version(AUTHOR_NAMES)
+
+        if not was_current:
+            return
+
+        with self.lock:
+            self.discard(author.pk)
+
+            if not deleted:
+                self.authors[author.pk] = (author.first_name, author.last_name)
+                for key in index_keys(author.first_name, author.last_name):
+                    insort(self.entries, (key, author.pk))
+
+        def adopt_version():
+            # skipped when a rebuild replaced the index in the meantime
+            if self.version == version:
+                self.version = current_version(AUTHOR_NAMES)
+
+        transaction.on_commit(adopt_version)
+
+
+def search_queryset(query:str) -> QuerySet:
+    """
+    This function is the fallback of the index: prefix range queries on the
+    first_name and last_name indexes, for the query as typed and title cased
+
+    :param query: The typed prefix
+    :type query: str
+    :return: The matching authors in name order.
+    """
+    query = " ".join(query.split())
+    condition = Q()
+
+    for prefix in {query, query.title()}:
+        condition |= Q(first_name__gte=prefix, first_name__lt=prefix + PREFIX_END)
+        condition |= Q(last_name__gte=prefix, last_name__lt=prefix + PREFIX_END)
+
+        if " " in prefix:
+            first_name, last_name = prefix.split(" ", 1)
+            condition |= Q(
+                first_name=first_name,
+                last_name__gte=last_name, last_name__lt=last_name + PREFIX_END
+            )
+
+    return (
+        Author.objects.filter(condition)
+        .order_by("last_name", "first_name", "id")
+        .values("id", "first_name", "last_name")
+    )
+
+
+author_index = AuthorIndex()
+
+
+def autocomplete(query:str, limit:int) -> List[dict]:
+    if author_index.is_current():
+        return author_index.search(query, limit)
+    return list(search_queryset(query)[:limit])
@@ -0,0 +1,254 @@
+# Native Imports
+import hashlib
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:
+    # Windows has no flock, its file cache falls back to the add lock
+    fcntl = None
+
+# Django Imports
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.filebased import FileBasedCache
+from django.db import transaction
+
+# Rest Framework Imports
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+
+# Striped in-process locks, so concurrent misses on one key in a worker
+# wait for a single rebuild without keeping a lock per key forever
+LOCKS = [threading.Lock() for _ in range(64)]
+
+# Version of the live author names alone, which the autocomplete index is
+# built from, so book count updates do not invalidate it
+AUTHOR_NAMES = "books.author.names"
+
+AUTHOR_NAMES_FIELDS = {"first_name", "last_name", "deleted_at"}
+
+
+def stripe(key:str) -> int:
+    # a stable stripe, hash() of a str differs between processes
+    return int(hashlib.sha1(key.encode()).hexdigest(), 16) % len(LOCKS)
+
+
+def is_flocked_cache() -> bool:
+    # the file cache, when the platform can lock its files
+    return fcntl is not None and isinstance(caches["default"], FileBasedCache)
+
+
+@contextmanager
+def cache_lock(key:str, timeout:float) -> Iterator[bool]:
+    """
+    This context manager locks a cache key across the processes sharing the
+    cache, waiting up to ``timeout`` seconds for a process holding it. The
+    file cache checks and sets keys in two steps, so it is locked with an
+    flock on a lock file next to it where available, other caches with an add
+
+    :param key: The cache key to be locked
+    :type key: str
+    :param timeout: The number of seconds to wait for the lock
+    :type timeout: float
+    :return: Whether the lock was taken before the timeout.
+    """
+    deadline = time.monotonic() + timeout
+
+    if is_flocked_cache():
+        directory = os.path.join(settings.CACHES["default"]["LOCATION"], "locks")
+        os.makedirs(directory, exist_ok=True)
+
+        with open(os.path.join(directory, f"{stripe(key)}.lock"), "a") as lock_file:
+            while True:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    locked = True
+                except BlockingIOError:
+                    locked = False
+                if locked or time.monotonic() >= deadline:
+                    break
+                time.sleep(0.05)
+
+            # closing the file releases the flock
+            yield locked
+        return
+
+    lock_key = f"{key}:lock"
+    while not (locked := cache.add(lock_key, True, int(timeout) + 1)):
+        if time.monotonic() >= deadline:
+            break
+        time.sleep(0.05)
+
+    try:
+        yield locked
+    finally:
+        if locked:
+            cache.delete(lock_key)
+
+
+def version_key(label:str) -> str:
+    return f"data-version:{label}"
+
+
+def bump_version(label:str) -> None:
+    """
+    This function gives a label a new data version, so everything cached
+    against the old one is missed. The version is set again on commit so
+    entries rebuilt while the write was in flight are missed as well
+
+    :param label: The data the version tracks, e.g. "books.book"
+    :type label: str
+    """
+    key = version_key(label)
+
+    def bump():
+        # a new random token rather than an increment, so concurrent
+        # bumps from several processes can never collapse into one
+        cache.set(key, uuid.uuid4().hex, None)
+
+    bump()
+    transaction.on_commit(bump)
+
+
+def bump_data_version(model) -> None:
+    # invalidates every cached response built from the rows of the model
+    bump_version(model._meta.label_lower)
+    count_write(model._meta.label_lower)
+
+
+def write_key(label:str, minute:int) -> str:
+    return f"writes:{label}:{minute}"
+
+
+def count_write(label:str) -> None:
+    # writes are counted in one bucket per minute, kept for the stats window
+    key = write_key(label, int(time.time() // 60))
+
+    def increment():
+        cache.add(key, 0, (settings.STATS_WRITE_WINDOW + 1) * 60)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # the bucket was evicted in between, losing one write is fine
+            pass
+
+    if not is_flocked_cache():
+        increment()
+        return
+
+    # the file cache reads and writes the count in two steps
+    with cache_lock(key, settings.RESPONSE_CACHE_LOCK_TIMEOUT):
+        increment()
+
+
+def write_rate(label:str) -> float:
+    """
+    This function returns the average number of writes per minute to the
+    data of a label over the last ``STATS_WRITE_WINDOW`` minutes
+
+    :param label: The data the writes are counted for, e.g. "books.book"
+    :type label: str
+    :return: The number of writes per minute.
+    """
+    minutes = settings.STATS_WRITE_WINDOW
+    now = int(time.time() // 60)
+    buckets = cache.get_many([write_key(label, now - offset) for offset in range(minutes)])
+    return sum(buckets.values()) / minutes
+
+
+def current_version(label:str) -> str:
+    key = version_key(label)
+    version = cache.get(key)
+
+    if version is None:
+        version = uuid.uuid4().hex
+        if not cache.add(key, version, None):
+            # another process created it first
+            version = cache.get(key, version)
+    return version
+
+
+def data_versions(labels:tuple) -> str:
+    keys = [version_key(label) for label in labels]
+    versions = cache.get_many(keys)
+
+    return ":".join(
+        versions[key] if key in versions else current_version(label)
+        for key, label in zip(keys, labels)
+    )
+
+
+def single_flight(key:str, build:Callable, timeout:int) -> Optional[object]:
+    """
+    This function returns the cached value of a key, building it on a miss.
+    Concurrent misses wait for one build instead of all rebuilding: threads
+    of a worker through an in-process lock, workers through ``cache_lock``
+
+    :param key: The cache key of the value
+    :type key: str
+    :param build: Builds the value, returning None for values not to be cached
+    :type build: Callable
+    :param timeout: The number of seconds the value is cached for
+    :type timeout: int
+    :return: The cached or built value.
+    """
+    value = cache.get(key)
+    if value is not None:
+        return value
+
+    with LOCKS[stripe(key)]:
+        value = cache.get(key)
+        if value is not None:
+            return value
+
+        # a request that waited past the timeout builds the value itself
+        with cache_lock(key, settings.RESPONSE_CACHE_LOCK_TIMEOUT):
+            value = cache.get(key)
+            if value is not None:
+                return value
+
+            value = build()
+            if value is not None:
+                cache.set(key, value, timeout)
+            return value
+
+
+def cache_response(*labels:str) -> Callable:
+    """
+    This decorator caches the successful responses of a view method by path,
+    query parameters and the data versions of the given models
+
+    :param labels: The models the response is built from, e.g. "books.book"
+    :type labels: str
+    :return: The decorated view method.
+    """
+    def decorator(method:Callable) -> Callable:
+        @wraps(method)
+        def wrapper(view, request:Request, *args, **kwargs) -> Response:
+            params = sorted(request.query_params.lists())
+            digest = hashlib.sha1(repr((request.path, params)).encode()).hexdigest()
+            key = f"response:{digest}:{data_versions(labels)}"
+            built = {}
+
+            def build():
+                built["response"] = method(view, request, *args, **kwargs)
+                if built["response"].status_code == status.HTTP_200_OK:
+                    return built["response"].data
+                return None
+
+            data = single_flight(key, build, settings.RESPONSE_CACHE_TIMEOUT)
+
+            if "response" in built:
+                return built["response"]
+            return Response(data=data, status=status.HTTP_200_OK)
+        return wrapper
+    return decorator
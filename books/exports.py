@@ -0,0 +1,163 @@
+# Native Imports
+import csv
+import io
+from typing import Callable, Dict, Iterator, List, Tuple
+
+# Own Imports
+from books.models import Author, Book
+
+# Optional Imports, Arrow and Parquet exports need pyarrow
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+
+# Exported columns of every table; books reference authors by id
+# instead of nesting them, so each author is written once
+EXPORT_TABLES = {
+    "books": (Book, ("id", "name", "isbn", "author_id")),
+    "authors": (Author, ("id", "first_name", "last_name", "book_count")),
+}
+
+INTEGER_FIELDS = ("AutoField", "BigAutoField", "ForeignKey", "PositiveIntegerField")
+
+
+def iter_batches(table:str, batch_size:int) -> Iterator[List[tuple]]:
+    """
+    This function streams the rows of an export table from a database
+    cursor in lists of ``batch_size`` tuples, in primary key order
+
+    :param table: The name of the table to be exported
+    :type table: str
+    :param batch_size: The number of rows per batch
+    :type batch_size: int
+    :return: An iterator of row batches.
+    """
+    model, columns = EXPORT_TABLES[table]
+    rows = model.objects.order_by("id").values_list(*columns).iterator(chunk_size=batch_size)
+
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def csv_stream(table:str, batch_size:int) -> Iterator[bytes]:
+    columns = EXPORT_TABLES[table][1]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+
+    for batch in iter_batches(table, batch_size):
+        writer.writerows(batch)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+
+    # header of an empty table
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+class ChunkSink(io.RawIOBase):
+    """Write-only file that hands back what pyarrow wrote since the last drain"""
+
+    def __init__(self) -> None:
+        self.chunks = []
+        self.position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def arrow_schema(table:str):
+    model, columns = EXPORT_TABLES[table]
+    return pyarrow.schema([
+        (
+            column,
+            pyarrow.int64()
+            if model._meta.get_field(column).get_internal_type() in INTEGER_FIELDS
+            else pyarrow.string()
+        )
+        for column in columns
+    ])
+
+
+def arrow_batches(table:str, batch_size:int):
+    schema = arrow_schema(table)
+
+    for batch in iter_batches(table, batch_size):
+        yield pyarrow.record_batch(
+            [
+                pyarrow.array(values, type=field.type)
+                for values, field in zip(zip(*batch), schema)
+            ],
+            schema=schema
+        )
+
+
+def arrow_stream(table:str, batch_size:int) -> Iterator[bytes]:
+    sink = ChunkSink()
+
+    with pyarrow.ipc.new_stream(sink, arrow_schema(table)) as writer:
+        for batch in arrow_batches(table, batch_size):
+            writer.write_batch(batch)
+            yield sink.drain()
+    yield sink.drain()
+
+
+def parquet_stream(table:str, batch_size:int) -> Iterator[bytes]:
+    sink = ChunkSink()
+
+    # one row group per batch, the footer is written on close
+    with pyarrow.parquet.ParquetWriter(sink, arrow_schema(table)) as writer:
+        for batch in arrow_batches(table, batch_size):
+            writer.write_batch(batch)
+            yield sink.drain()
+    yield sink.drain()
+
+
+# Export writers keyed by file type: (file extension, content type, writer)
+FILE_TYPES: Dict[str, Tuple[str, str, Callable]] = {
+    "csv": ("csv", "text/csv", csv_stream),
+}
+
+if pyarrow is not None:
+    FILE_TYPES["arrow"] = ("arrows", "application/vnd.apache.arrow.stream", arrow_stream)
+    FILE_TYPES["parquet"] = ("parquet", "application/vnd.apache.parquet", parquet_stream)
+
+
+def export(table:str, file_type:str = "csv", batch_size:int = 5000) -> Iterator[bytes]:
+    """
+    This function streams an export of a catalogue table in the given
+    file type, encoding one batch of cursor results at a time
+
+    :param table: The name of the table to be exported, books or authors
+    :type table: str
+    :param file_type: csv, or arrow and parquet when pyarrow is installed
+    :type file_type: str
+    :param batch_size: The number of rows encoded at a time
+    :type batch_size: int
+    :return: An iterator of encoded chunks.
+    """
+    return FILE_TYPES[file_type][2](table, batch_size)
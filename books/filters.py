@@ -0,0 +1,95 @@
+# Django Imports
+from django.db.models import QuerySet
+
+# Rest Framework Imports
+from rest_framework import serializers
+
+# Own Imports
+from books.serializers import ISBNField
+
+
+# Upper bound appended to a prefix so ``prefix <= value < prefix + PREFIX_END``
+# matches every value starting with the prefix as an index range scan.
+PREFIX_END = "\U0010ffff"
+
+
+class ListFilterSerializer(serializers.Serializer):
+    """
+    Validates list query parameters against a whitelist of indexed columns.
+
+    Subclasses declare the accepted parameters as serializer fields, map them
+    onto lookups in ``lookups`` and map each allowed ``ordering`` value onto
+    its columns in ``order_by``.
+    Parameters in ``prefix_lookups`` are matched as a range on the column,
+    which is served by a plain index on every database backend.
+    """
+
+    lookups = {}
+    prefix_lookups = {}
+    order_by = {}
+
+    def filter_queryset(self, queryset:QuerySet) -> QuerySet:
+        """
+        This method applies the validated filters and ordering to a queryset
+
+        :param queryset: The queryset to be filtered
+        :type queryset: QuerySet
+        :return: A filtered and ordered QuerySet.
+        """
+        params = dict(self.validated_data)
+        order = params.pop("ordering", None)
+
+        for param, value in params.items():
+            if param in self.prefix_lookups:
+                column = self.prefix_lookups[param]
+                queryset = queryset.filter(**{
+                    f"{column}__gte": value, f"{column}__lt": value + PREFIX_END
+                })
+            else:
+                queryset = queryset.filter(**{self.lookups[param]: value})
+
+        if order:
+            queryset = queryset.order_by(*self.order_by[order])
+        return queryset
+
+
+class BookFilterSerializer(ListFilterSerializer):
+    author_id = serializers.IntegerField(required=False, min_value=1)
+    isbn = ISBNField(required=False, help_text="ISBN-10 or ISBN-13, with or without hyphens")
+    name = serializers.CharField(required=False, help_text="Book name prefix")
+    ordering = serializers.ChoiceField(
+        required=False, choices=("name", "-name", "id", "-id")
+    )
+
+    lookups = {"author_id": "author_id", "isbn": "isbn"}
+    prefix_lookups = {"name": "name"}
+    order_by = {
+        "name": ("name",), "-name": ("-name",),
+        "id": ("id",), "-id": ("-id",),
+    }
+
+
+class AuthorFilterSerializer(ListFilterSerializer):
+    last_name = serializers.CharField(required=False, help_text="Author last name prefix")
+    min_books = serializers.IntegerField(
+        required=False, min_value=0, help_text="Minimum number of books"
+    )
+    ordering = serializers.ChoiceField(
+        required=False, 
+        choices=("last_name", "-last_name", "book_count", "-book_count", "id", "-id")
+    )
+
+    lookups = {"min_books": "book_count__gte"}
+    prefix_lookups = {"last_name": "last_name"}
+    order_by = {
+        "last_name": ("last_name", "first_name"),
+        "-last_name": ("-last_name", "-first_name"),
+        "book_count": ("book_count", "id"),
+        "-book_count": ("-book_count", "-id"),
+        "id": ("id",), "-id": ("-id",),
+    }
+
+
+class AuthorAutocompleteSerializer(serializers.Serializer):
+    q = serializers.CharField(max_length=100, help_text="Prefix of a first, last or full name")
+    limit = serializers.IntegerField(required=False, min_value=1, max_value=50, default=10)
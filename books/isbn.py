@@ -0,0 +1,79 @@
+# Native Imports
+from typing import Iterable, List, Optional
+
+
+# Separators clients commonly send inside an ISBN
+SEPARATORS = str.maketrans("", "", "- \t")
+
+ISBN10_WEIGHTS = range(10, 1, -1)
+
+ISBN13_WEIGHTS = (1, 3) * 6
+
+
+class InvalidISBN(ValueError):
+    pass
+
+
+def is_digits(value:str) -> bool:
+    # str.isdigit() also accepts digits like "²" that int() rejects
+    return value.isascii() and value.isdigit()
+
+
+def isbn13_check_digit(first_twelve:str) -> str:
+    total = sum(int(digit) * weight for digit, weight in zip(first_twelve, ISBN13_WEIGHTS))
+    return str(-total % 10)
+
+
+def isbn10_check_digit(first_nine:str) -> str:
+    total = sum(int(digit) * weight for digit, weight in zip(first_nine, ISBN10_WEIGHTS))
+    check = -total % 11
+    return "X" if check == 10 else str(check)
+
+
+def canonical_isbn(value:str) -> str:
+    """
+    This function validates an ISBN-10 or ISBN-13, with or without separators,
+    and returns it in the canonical form stored on books: 13 bare digits
+
+    :param value: The ISBN as sent by the client
+    :type value: str
+    :return: The canonical ISBN-13.
+    """
+    isbn = str(value).translate(SEPARATORS).upper()
+
+    if len(isbn) == 10:
+        if not is_digits(isbn[:9]) or isbn10_check_digit(isbn[:9]) != isbn[9]:
+            raise InvalidISBN(f"{value!r} is not a valid ISBN-10")
+        body = "978" + isbn[:9]
+        return body + isbn13_check_digit(body)
+
+    if len(isbn) == 13:
+        if (
+            not is_digits(isbn)
+            or isbn[:3] not in ("978", "979")
+            or isbn13_check_digit(isbn[:12]) != isbn[12]
+        ):
+            raise InvalidISBN(f"{value!r} is not a valid ISBN-13")
+        return isbn
+
+    raise InvalidISBN(f"{value!r} is not a valid ISBN, expected 10 or 13 digits")
+
+
+def canonical_isbns(values:Iterable[str]) -> List[Optional[str]]:
+    """
+    This function canonicalizes a batch of ISBNs for bulk backfills,
+    returning None in place of every invalid value instead of raising
+
+    :param values: The ISBNs to be canonicalized
+    :type values: Iterable[str]
+    :return: The canonical ISBN-13s in input order.
+    """
+    results = []
+    append = results.append
+
+    for value in values:
+        try:
+            append(canonical_isbn(value))
+        except InvalidISBN:
+            append(None)
+    return results
@@ -0,0 +1,434 @@
+# Native Imports
+import traceback
+from collections import Counter
+from datetime import timedelta
+from typing import Callable, Dict, NamedTuple, Optional
+
+# Django Imports
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, Exists, F, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.db.models.lookups import LessThan
+from django.utils import timezone
+
+# Own Imports
+from books.isbn import canonical_isbns
+from books.models import ArchivedAuthor, ArchivedBook, Author, Book, Job
+
+
+class Task(NamedTuple):
+    func: Callable
+    concurrency: Optional[int]
+    every: Optional[int] = None
+
+
+# Registry of the tasks a job can run, keyed by job name
+TASKS: Dict[str, Task] = {}
+
+
+def task(name:str = None, concurrency:int = None, every:int = None) -> Callable:
+    """
+    This decorator registers a function as a background task. The function
+    is called with the job and its payload and returns a JSON serializable result
+
+    :param name: The job name of the task, defaults to the function name
+    :type name: str
+    :param concurrency: The maximum number of jobs of this task running at once
+    :type concurrency: int
+    :param every: Seconds between jobs the worker queues for the task by itself
+    :type every: int
+    :return: The decorated function.
+    """
+    def decorator(func:Callable) -> Callable:
+        TASKS[name or func.__name__] = Task(func=func, concurrency=concurrency, every=every)
+        return func
+    return decorator
+
+
+def enqueue(name:str, payload:dict = None, max_attempts:int = 3) -> Job:
+    """
+    This function adds a job for a registered task to the queue
+
+    :param name: The name of the task to be run
+    :type name: str
+    :param payload: The arguments passed to the task
+    :type payload: dict
+    :param max_attempts: The number of times the job is tried before it fails
+    :type max_attempts: int
+    :return: A Job object.
+    """
+    if name not in TASKS:
+        raise LookupError(f"Unknown task {name!r}")
+    return Job.objects.create(name=name, payload=payload or {}, max_attempts=max_attempts)
+
+
+def set_progress(job:Job, done:int, total:int) -> None:
+    """
+    This function records how far a running job is
+
+    :param job: The running job
+    :type job: Job
+    :param done: The number of units processed so far
+    :type done: int
+    :param total: The total number of units
+    :type total: int
+    """
+    job.progress = min(done / total, 1.0) if total else 1.0
+    Job.objects.filter(id=job.id).update(progress=job.progress, updated_at=timezone.now())
+
+
+def running_counts() -> Dict[str, int]:
+    # the number of running jobs of every task
+    return dict(
+        Job.objects.filter(status=Job.Status.RUNNING)
+        .values_list("name").annotate(count=Count("id"))
+    )
+
+
+def claim_job(worker:str = "") -> Optional[Job]:
+    """
+    This function claims the next due job whose task is below its concurrency
+    limit. The claim is a conditional UPDATE on the pending status and on the
+    number of running jobs of the task, so two workers racing for the same
+    job, or for the last free slot of a task, cannot both win it
+
+    :param worker: The id of the claiming worker, recorded as the job owner
+    :type worker: str
+    :return: The claimed Job object, or None when nothing is due.
+    """
+    # tasks at their limit are skipped up front, the UPDATE has the final say
+    running = running_counts()
+    saturated = [
+        name for name, entry in TASKS.items()
+        if entry.concurrency and running.get(name, 0) >= entry.concurrency
+    ]
+
+    now = timezone.now()
+    candidates = (
+        Job.objects.filter(status=Job.Status.PENDING, run_after__lte=now)
+        .exclude(name__in=saturated)
+        .order_by("run_after", "id")
+        .values_list("id", "name")[:10]
+    )
+
+    for job_id, name in candidates:
+        claimable = Job.objects.filter(id=job_id, status=Job.Status.PENDING)
+
+        entry = TASKS.get(name)
+        if entry and entry.concurrency:
+            # counted in the same statement, which SQLite runs under its write lock
+            running_jobs = (
+                Job.objects.filter(name=name, status=Job.Status.RUNNING)
+                .values("name").annotate(count=Count("id")).values("count")
+            )
+            claimable = claimable.filter(
+                LessThan(Coalesce(Subquery(running_jobs), 0), entry.concurrency)
+            )
+
+        claimed = claimable.update(
+            status=Job.Status.RUNNING, worker=worker,
+            attempts=F("attempts") + 1, updated_at=now
+        )
+        if claimed:
+            return Job.objects.get(id=job_id)
+    return None
+
+
+def run_job(job_id:int) -> str:
+    """
+    This function runs a claimed job and records its outcome. Failed jobs
+    are retried with exponential backoff until they run out of attempts
+
+    :param job_id: The id of the claimed job
+    :type job_id: int
+    :return: The final status of the job run.
+    """
+    job = Job.objects.get(id=job_id)
+
+    try:
+        entry = TASKS.get(job.name)
+        if entry is None:
+            raise LookupError(f"Unknown task {job.name!r}")
+        result = entry.func(job, job.payload)
+
+    except Exception:
+        now = timezone.now()
+        if job.attempts < job.max_attempts:
+            status = Job.Status.PENDING
+            run_after = now + timedelta(
+                seconds=settings.JOB_RETRY_BACKOFF * 2 ** (job.attempts - 1)
+            )
+        else:
+            status = Job.Status.FAILED
+            run_after = job.run_after
+
+        Job.objects.filter(id=job.id).update(
+            status=status, run_after=run_after,
+            error=traceback.format_exc(), updated_at=now
+        )
+        return status
+
+    Job.objects.filter(id=job.id).update(
+        status=Job.Status.SUCCEEDED, progress=1.0, result=result,
+        error="", updated_at=timezone.now()
+    )
+    return Job.Status.SUCCEEDED
+
+
+def schedule_periodic_jobs() -> int:
+    """
+    This function queues a job for every periodic task whose last job was
+    queued more than ``every`` seconds ago
+
+    :return: The number of queued jobs.
+    """
+    periodic = {name: entry.every for name, entry in TASKS.items() if entry.every}
+    last_queued = dict(
+        Job.objects.filter(name__in=periodic)
+        .values_list("name").annotate(last=Max("created_at"))
+    )
+
+    now = timezone.now()
+    due = [
+        name for name, every in periodic.items()
+        if name not in last_queued or last_queued[name] <= now - timedelta(seconds=every)
+    ]
+    for name in due:
+        enqueue(name)
+    return len(due)
+
+
+def requeue_jobs(jobs) -> int:
+    """
+    This function returns running jobs whose worker stopped to the queue.
+    Jobs out of attempts are marked failed instead, so a job that keeps
+    killing its worker is not run forever
+
+    :param jobs: The running jobs to be requeued
+    :type jobs: QuerySet
+    :return: The number of requeued jobs.
+    """
+    now = timezone.now()
+    jobs = jobs.filter(status=Job.Status.RUNNING)
+
+    jobs.filter(attempts__gte=F("max_attempts")).update(
+        status=Job.Status.FAILED, error="The worker stopped while running the job",
+        worker="", updated_at=now
+    )
+    return jobs.update(status=Job.Status.PENDING, worker="", updated_at=now)
+
+
+def release_jobs(worker:str) -> int:
+    """
+    This function returns the running jobs of a worker that is shutting down
+    to the queue, giving back the attempt they were claimed with
+
+    :param worker: The id of the worker
+    :type worker: str
+    :return: The number of released jobs.
+    """
+    return Job.objects.filter(status=Job.Status.RUNNING, worker=worker).update(
+        status=Job.Status.PENDING, worker="",
+        attempts=F("attempts") - 1, updated_at=timezone.now()
+    )
+
+
+def heartbeat(worker:str) -> int:
+    # marks the running jobs of a live worker as not abandoned
+    return Job.objects.filter(status=Job.Status.RUNNING, worker=worker).update(
+        updated_at=timezone.now()
+    )
+
+
+def requeue_stale_jobs(stale_after:int) -> int:
+    """
+    This function returns running jobs whose worker has not sent a heartbeat
+    for ``stale_after`` seconds to the queue, e.g. after it was killed
+
+    :param stale_after: The number of seconds without progress
+    :type stale_after: int
+    :return: The number of requeued jobs.
+    """
+    return requeue_jobs(
+        Job.objects.filter(updated_at__lt=timezone.now() - timedelta(seconds=stale_after))
+    )
+
+
+@task(concurrency=1)
+def import_books(job:Job, payload:dict) -> dict:
+    """
+    This task imports a list of books in the BookSerializer format,
+    inserting valid books in batches and reporting invalid ones by index
+    """
+    # imported here, the serializers module imports this one
+    from books.serializers import BookSerializer
+
+    items = payload.get("books", [])
+    batch_size = payload.get("batch_size", 500)
+    authors = {}
+
+    # every batch commits together with a cursor in the job result,
+    # so a retried import resumes after the last committed batch
+    cursor = job.result or {}
+    errors = cursor.get("errors", {})
+    created = cursor.get("created", 0)
+
+    for start in range(cursor.get("next", 0), len(items), batch_size):
+        books = []
+
+        with transaction.atomic():
+            for index, item in enumerate(items[start:start + batch_size], start):
+                serializer = BookSerializer(data=item)
+                if not serializer.is_valid():
+                    errors[str(index)] = serializer.errors
+                    continue
+
+                data = dict(serializer.validated_data)
+                author_data = data.pop("author")
+                key = (author_data["first_name"], author_data["last_name"])
+
+                if key not in authors:
+                    authors[key] = BookSerializer.get_or_create_author(author_data)
+                books.append(Book(author=authors[key], **data))
+
+            # bulk_create sends no post_save, so count the books here
+            Book.objects.bulk_create(books)
+            Author.adjust_book_counts(Counter(book.author_id for book in books))
+
+            created += len(books)
+            job.result = {"created": created, "errors": errors, "next": start + batch_size}
+            Job.objects.filter(id=job.id).update(result=job.result)
+
+        set_progress(job, start + batch_size, len(items))
+
+    return {"created": created, "errors": errors}
+
+
+@task(concurrency=1)
+def normalize_isbns(job:Job, payload:dict) -> dict:
+    """
+    This task backfills the canonical ISBN-13 of books stored before
+    ISBNs were validated, rewriting only the rows whose ISBN changes
+    """
+    batch_size = payload.get("batch_size", 1000)
+    total = Book.objects.count()
+    last_id = 0
+    done = updated = 0
+    invalid = []
+
+    while True:
+        rows = list(
+            Book.objects.filter(id__gt=last_id).order_by("id")
+            .values_list("id", "isbn")[:batch_size]
+        )
+        if not rows:
+            break
+
+        ids, isbns = zip(*rows)
+        changed = []
+
+        for book_id, isbn, canonical in zip(ids, isbns, canonical_isbns(isbns)):
+            if canonical is None:
+                invalid.append(book_id)
+            elif canonical != isbn:
+                changed.append(Book(id=book_id, isbn=canonical))
+
+        Book.objects.bulk_update(changed, ["isbn"])
+
+        last_id = ids[-1]
+        done += len(rows)
+        updated += len(changed)
+        set_progress(job, done, total)
+
+    # ids of rows needing manual repair, capped to keep the result small
+    return {"updated": updated, "invalid": len(invalid), "invalid_ids": invalid[:100]}
+
+
+@task(concurrency=1)
+def analyze(job:Job, payload:dict) -> dict:
+    """
+    This task refreshes the query planner statistics of the
+    catalogue tables, e.g. after a large import
+    """
+    tables = [Author._meta.db_table, Book._meta.db_table]
+
+    with connection.cursor() as cursor:
+        for done, table in enumerate(tables, 1):
+            cursor.execute(f"ANALYZE {connection.ops.quote_name(table)}")
+            set_progress(job, done, len(tables))
+
+    return {"tables": tables}
+
+
+def incremental_vacuum(pages:int) -> int:
+    """
+    This function returns up to ``pages`` free pages of the SQLite file to the
+    file system, a short step instead of a VACUUM rewriting the whole file.
+    Other databases reclaim space themselves
+
+    :param pages: The maximum number of pages freed
+    :type pages: int
+    :return: The number of pages freed.
+    """
+    if connection.vendor != "sqlite":
+        return 0
+
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA freelist_count")
+        before = cursor.fetchone()[0]
+        cursor.execute(f"PRAGMA incremental_vacuum({int(pages)})")
+        cursor.fetchall()
+        cursor.execute("PRAGMA freelist_count")
+        return before - cursor.fetchone()[0]
+
+
+def archive_batch(model, archive_model, fields:tuple, queryset, batch_size:int) -> int:
+    # copies a batch of rows to the archive and deletes them in one transaction
+    with transaction.atomic():
+        rows = list(queryset.values(*fields)[:batch_size])
+        if rows:
+            archived_at = timezone.now()
+            archive_model.objects.bulk_create(
+                [archive_model(archived_at=archived_at, **row) for row in rows]
+            )
+            model.all_objects.filter(id__in=[row["id"] for row in rows]).delete()
+    return len(rows)
+
+
+@task(concurrency=1, every=settings.ARCHIVE_INTERVAL)
+def archive_deleted(job:Job, payload:dict) -> dict:
+    """
+    This task moves books and authors soft deleted more than
+    ``ARCHIVE_AFTER_DAYS`` days ago to the archive tables in batches,
+    freeing the pages of each batch with an incremental vacuum
+    """
+    cutoff = timezone.now() - timedelta(days=payload.get("after_days", settings.ARCHIVE_AFTER_DAYS))
+    batch_size = payload.get("batch_size", 1000)
+    vacuum_pages = payload.get("vacuum_pages", 1000)
+
+    books = Book.all_objects.filter(deleted_at__lt=cutoff)
+    # authors are archived once none of their books is left behind,
+    # deleting them would cascade to books that were never archived
+    authors = Author.all_objects.filter(deleted_at__lt=cutoff).exclude(
+        Exists(Book.all_objects.filter(author=OuterRef("pk")))
+    )
+    stages = [
+        ("books", Book, ArchivedBook, ("id", "name", "isbn", "author_id", "deleted_at"), books),
+        ("authors", Author, ArchivedAuthor, ("id", "first_name", "last_name", "deleted_at"), authors),
+    ]
+
+    total = books.count() + authors.count()
+    result = {"books": 0, "authors": 0, "vacuumed_pages": 0}
+
+    for table, model, archive_model, fields, queryset in stages:
+        while True:
+            archived = archive_batch(model, archive_model, fields, queryset, batch_size)
+            if not archived:
+                break
+
+            result[table] += archived
+            result["vacuumed_pages"] += incremental_vacuum(vacuum_pages)
+            set_progress(job, result["books"] + result["authors"], total)
+
+    return result
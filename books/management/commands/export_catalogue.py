@@ -0,0 +1,45 @@
+# Native Imports
+import sys
+
+# Django Imports
+from django.core.management.base import BaseCommand, CommandError
+
+# Own Imports
+from books.exports import EXPORT_TABLES, FILE_TYPES, export
+
+
+class Command(BaseCommand):
+    help = "Writes a columnar export of the books or authors table in batches"
+    
+    def add_arguments(self, parser):
+        parser.add_argument("table", choices=sorted(EXPORT_TABLES))
+        parser.add_argument(
+            "--file-type", default="csv", 
+            help="csv, or arrow and parquet when pyarrow is installed",
+        )
+        parser.add_argument(
+            "--output", default="-", 
+            help="File to write to, - writes to standard output",
+        )
+        parser.add_argument("--batch-size", type=int, default=5000)
+    
+    def handle(self, *args, **options):
+        file_type = options["file_type"]
+        
+        if file_type not in FILE_TYPES:
+            raise CommandError(
+                f"Unsupported file type {file_type!r}, expected one of: "
+                f"{', '.join(sorted(FILE_TYPES))}"
+            )
+        
+        chunks = export(options["table"], file_type, options["batch_size"])
+        
+        if options["output"] == "-":
+            for chunk in chunks:
+                sys.stdout.buffer.write(chunk)
+            return
+        
+        with open(options["output"], "wb") as output:
+            for chunk in chunks:
+                output.write(chunk)
+        self.stderr.write(f"Exported {options['table']} to {options['output']}")
@@ -0,0 +1,30 @@
+# Django Imports
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+# Own Imports
+from books.models import Author, Book
+
+
+class Command(BaseCommand):
+    help = "Recomputes the denormalized book_count of every author from the books table"
+    
+    def handle(self, *args, **options):
+        actual = Coalesce(
+            Subquery(
+                Book.objects.filter(author=OuterRef("pk"))
+                .order_by().values("author").annotate(count=Count("id")).values("count")
+            ),
+            0
+        )
+        
+        with transaction.atomic():
+            drifted = list(
+                Author.objects.annotate(actual=actual)
+                .exclude(book_count=F("actual")).values_list("id", flat=True)
+            )
+            Author.objects.filter(id__in=drifted).update(book_count=actual)
+        
+        self.stdout.write(f"Recounted {len(drifted)} author(s) with a wrong book count")
@@ -0,0 +1,213 @@
+# Native Imports
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Iterator
+
+# Django Imports
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+# Own Imports
+from books.jobs import (
+    claim_job, heartbeat, release_jobs, requeue_jobs,
+    requeue_stale_jobs, run_job, schedule_periodic_jobs,
+)
+from books.models import Job
+
+
+class WorkerStopped(BaseException):
+    """Raised by SIGTERM, unwinding the running job like KeyboardInterrupt"""
+
+
+class Command(BaseCommand):
+    help = "Runs queued background jobs in a pool of worker processes"
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--processes", type=int, default=settings.JOB_WORKER_PROCESSES,
+            help="Number of jobs run at once; 1 runs jobs in this process",
+        )
+        parser.add_argument(
+            "--poll-interval", type=float, default=settings.JOB_POLL_INTERVAL,
+            help="Seconds to wait between polls of an empty queue",
+        )
+        parser.add_argument(
+            "--once", action="store_true",
+            help="Exit once no job is due instead of polling forever",
+        )
+    
+    def handle(self, *args, **options):
+        processes = max(options["processes"], 1)
+        poll_interval = options["poll_interval"]
+        once = options["once"]
+        
+        # recorded on the jobs this worker claims, so it can keep them alive
+        # with heartbeats and hand them back when it is stopped
+        self.worker = f"{socket.gethostname()}:{os.getpid()}"
+        self.next_schedule = self.next_sweep = self.next_heartbeat = 0
+        previous_handler = signal.signal(signal.SIGTERM, self.stop)
+        
+        try:
+            if processes == 1:
+                self.run_inline(poll_interval, once)
+            else:
+                self.run_pool(processes, poll_interval, once)
+        except (WorkerStopped, KeyboardInterrupt):
+            released = release_jobs(self.worker)
+            self.stdout.write(f"Stopped, returned {released} running job(s) to the queue")
+        finally:
+            signal.signal(signal.SIGTERM, previous_handler)
+    
+    def stop(self, signum, frame) -> None:
+        raise WorkerStopped()
+    
+    def tick(self) -> None:
+        self.schedule()
+        self.sweep()
+        self.beat()
+    
+    def schedule(self) -> None:
+        # periodic tasks are checked once a minute rather than on every poll
+        if time.monotonic() < self.next_schedule:
+            return
+        
+        queued = schedule_periodic_jobs()
+        if queued:
+            self.stdout.write(f"Queued {queued} periodic job(s)")
+        self.next_schedule = time.monotonic() + 60
+    
+    def sweep(self) -> None:
+        # jobs of workers that died without handing them back
+        if time.monotonic() < self.next_sweep:
+            return
+        
+        requeued = requeue_stale_jobs(settings.JOB_STALE_AFTER)
+        if requeued:
+            self.stdout.write(f"Requeued {requeued} abandoned job(s)")
+        self.next_sweep = time.monotonic() + settings.JOB_HEARTBEAT_INTERVAL
+    
+    def beat(self) -> None:
+        # keeps the jobs running in the pool from looking abandoned
+        if time.monotonic() < self.next_heartbeat:
+            return
+        
+        heartbeat(self.worker)
+        self.next_heartbeat = time.monotonic() + settings.JOB_HEARTBEAT_INTERVAL
+    
+    @contextmanager
+    def heartbeat_thread(self) -> Iterator[None]:
+        # the loop is busy with the job it runs inline, a thread beats meanwhile
+        stopped = threading.Event()
+        
+        def beat():
+            try:
+                while not stopped.wait(settings.JOB_HEARTBEAT_INTERVAL):
+                    heartbeat(self.worker)
+            finally:
+                connections.close_all()
+        
+        thread = threading.Thread(target=beat, daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stopped.set()
+            thread.join()
+    
+    def run_inline(self, poll_interval:float, once:bool) -> None:
+        while True:
+            self.tick()
+            job = claim_job(self.worker)
+            
+            if job is None:
+                if once:
+                    return
+                time.sleep(poll_interval)
+                continue
+            
+            with self.heartbeat_thread():
+                status = run_job(job.id)
+            self.report(job.id, status)
+    
+    def run_pool(self, processes:int, poll_interval:float, once:bool) -> None:
+        # spawned children set Django up themselves instead of inheriting
+        # the parent's open database connections through fork()
+        connections.close_all()
+        pool = self.create_pool(processes)
+        running = {}
+        
+        try:
+            while True:
+                self.tick()
+                while len(running) < processes:
+                    job = claim_job(self.worker)
+                    if job is None:
+                        break
+                    try:
+                        running[pool.submit(run_job, job.id)] = job.id
+                    except BrokenProcessPool as error:
+                        self.crashed(job.id, error)
+                        pool = self.restart_pool(pool, running, processes)
+                        break
+                
+                if not running:
+                    if once:
+                        return
+                    time.sleep(poll_interval)
+                    continue
+                
+                done, _ = wait(running, timeout=poll_interval, return_when=FIRST_COMPLETED)
+                broken = False
+                for future in done:
+                    job_id = running.pop(future)
+                    try:
+                        self.report(job_id, future.result())
+                    except Exception as error:
+                        # a dead child breaks the whole pool, and errors raised
+                        # before run_job records the outcome surface here too
+                        self.crashed(job_id, error)
+                        broken = broken or isinstance(error, BrokenProcessPool)
+                
+                if broken:
+                    pool = self.restart_pool(pool, running, processes)
+        finally:
+            if running:
+                # stopped with jobs in flight, which are handed back unfinished
+                for process in multiprocessing.active_children():
+                    process.terminate()
+            pool.shutdown()
+    
+    def create_pool(self, processes:int) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=django.setup,
+        )
+    
+    def restart_pool(self, pool:ProcessPoolExecutor, running:dict, processes:int) -> ProcessPoolExecutor:
+        # the jobs still running went down with the broken pool
+        for job_id in running.values():
+            self.crashed(job_id, BrokenProcessPool("The worker pool broke"))
+        running.clear()
+        
+        # its futures have all failed already, nothing is left to cancel
+        pool.shutdown(wait=False)
+        self.stderr.write("Restarted the worker pool")
+        return self.create_pool(processes)
+    
+    def crashed(self, job_id:int, error:Exception) -> None:
+        # the job goes back to the queue, or fails once out of attempts
+        self.stderr.write(f"Job {job_id} crashed: {error!r}")
+        requeue_jobs(Job.objects.filter(id=job_id))
+    
+    def report(self, job_id:int, status:str) -> None:
+        self.stdout.write(f"Job {job_id} {status}")
@@ -0,0 +1,43 @@
+# Generated by Django 4.1.13 on 2026-10-19 18:41
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_books(apps, schema_editor):
+    Author = apps.get_model("books", "Author")
+    Book = apps.get_model("books", "Book")
+
+    Author.objects.update(
+        book_count=Coalesce(
+            Subquery(
+                Book.objects.filter(author=OuterRef("pk"))
+                .order_by()
+                .values("author")
+                .annotate(count=Count("id"))
+                .values("count")
+            ),
+            0,
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("books", "0003_job"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="author",
+            name="book_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name="author",
+            index=models.Index(fields=["book_count"], name="authors_book_count_idx"),
+        ),
+        migrations.RunPython(count_books, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.1.13 on 2026-10-19 18:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("books", "0004_author_book_count"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="author",
+            index=models.Index(fields=["first_name"], name="authors_first_name_idx"),
+        ),
+    ]
@@ -0,0 +1,135 @@
+# Generated by Django 4.1.13 on 2026-10-19 19:05
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("books", "0005_author_first_name_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedAuthor",
+            fields=[
+                ("id", models.IntegerField(primary_key=True, serialize=False)),
+                ("first_name", models.TextField()),
+                ("last_name", models.TextField()),
+                ("deleted_at", models.DateTimeField()),
+                (
+                    "archived_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "Archived authors",
+                "db_table": "authors_archive",
+            },
+        ),
+        migrations.CreateModel(
+            name="ArchivedBook",
+            fields=[
+                ("id", models.IntegerField(primary_key=True, serialize=False)),
+                ("name", models.TextField()),
+                ("isbn", models.TextField()),
+                ("author_id", models.IntegerField(db_index=True)),
+                ("deleted_at", models.DateTimeField()),
+                (
+                    "archived_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "Archived books",
+                "db_table": "books_archive",
+            },
+        ),
+        migrations.RemoveIndex(
+            model_name="author",
+            name="authors_name_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="author",
+            name="authors_book_count_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="author",
+            name="authors_first_name_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="book",
+            name="books_name_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="book",
+            name="books_isbn_idx",
+        ),
+        migrations.AddField(
+            model_name="author",
+            name="deleted_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="book",
+            name="deleted_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="author",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["last_name", "first_name"],
+                name="authors_name_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="author",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["first_name"],
+                name="authors_first_name_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="author",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["book_count"],
+                name="authors_book_count_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="author",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", False)),
+                fields=["deleted_at"],
+                name="authors_deleted_at_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="book",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["name"],
+                name="books_name_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="book",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["isbn"],
+                name="books_isbn_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="book",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", False)),
+                fields=["deleted_at"],
+                name="books_deleted_at_idx",
+            ),
+        ),
+    ]
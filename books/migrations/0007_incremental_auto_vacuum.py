@@ -0,0 +1,29 @@
+from django.db import migrations
+
+
+def enable_incremental_vacuum(apps, schema_editor):
+    # SQLite only returns the pages freed by deletes to the file system when
+    # auto_vacuum is incremental, and switching modes needs one full VACUUM
+    connection = schema_editor.connection
+    if connection.vendor != "sqlite":
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA auto_vacuum")
+        if cursor.fetchone()[0] != 2:
+            cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            cursor.execute("VACUUM")
+
+
+class Migration(migrations.Migration):
+
+    # VACUUM cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("books", "0006_soft_delete_and_archive"),
+    ]
+
+    operations = [
+        migrations.RunPython(enable_incremental_vacuum, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.1.13 on 2026-10-19 19:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("books", "0007_incremental_auto_vacuum"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="job",
+            name="worker",
+            field=models.TextField(blank=True),
+        ),
+    ]
@@ -1,16 +1,152 @@
-from django.db import models
+# Native Imports
+from collections import Counter
+from typing import Dict
+
+# Django Imports
+from django.db import models, transaction
+from django.db.models import Case, F, Q, Value, When
+from django.utils import timezone
+
+# Own Imports
+from books.cache import AUTHOR_NAMES, AUTHOR_NAMES_FIELDS, bump_data_version, bump_version
+
+
+# Condition of the partial indexes, which cover the live rows only
+LIVE = Q(deleted_at__isnull=True)
+
+DELETED = Q(deleted_at__isnull=False)
+
+
+class VersionedQuerySet(models.QuerySet):
+    """
+    QuerySet bumping the data version of its model on bulk writes, which send
+    no signals; saves and deletes bump it from books.signals
+    """
+    
+    def update(self, **kwargs) -> int:
+        rows = super().update(**kwargs)
+        bump_data_version(self.model)
+        return rows
+    
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = super().bulk_create(objs, *args, **kwargs)
+        bump_data_version(self.model)
+        return objs
+    
+    def bulk_update(self, objs, fields, *args, **kwargs) -> int:
+        rows = super().bulk_update(objs, fields, *args, **kwargs)
+        bump_data_version(self.model)
+        return rows
+
+
+class LiveManager(models.Manager):
+    """Default manager of the soft deletable models, which hides soft deleted rows"""
+    
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
+class AuthorQuerySet(VersionedQuerySet):
+    """VersionedQuerySet also bumping the author names version when names are written"""
+    
+    def soft_delete(self) -> int:
+        """
+        This method soft deletes the live authors of the queryset together
+        with their books
+        
+        :return: The number of authors deleted.
+        """
+        with transaction.atomic(savepoint=False):
+            ids = list(self.filter(LIVE).select_for_update().values_list("id", flat=True))
+            if not ids:
+                return 0
+            
+            Book.objects.filter(author_id__in=ids).soft_delete()
+            return Author.all_objects.filter(id__in=ids).update(deleted_at=timezone.now())
+    
+    def update(self, **kwargs) -> int:
+        if AUTHOR_NAMES_FIELDS.intersection(kwargs):
+            bump_version(AUTHOR_NAMES)
+        return super().update(**kwargs)
+    
+    def bulk_create(self, objs, *args, **kwargs):
+        bump_version(AUTHOR_NAMES)
+        return super().bulk_create(objs, *args, **kwargs)
+    
+    def bulk_update(self, objs, fields, *args, **kwargs) -> int:
+        if AUTHOR_NAMES_FIELDS.intersection(fields):
+            bump_version(AUTHOR_NAMES)
+        return super().bulk_update(objs, fields, *args, **kwargs)
+
+
+class BookQuerySet(VersionedQuerySet):
+    
+    def soft_delete(self) -> int:
+        """
+        This method soft deletes the live books of the queryset and takes
+        them off the book counts of their authors
+        
+        :return: The number of books deleted.
+        """
+        with transaction.atomic(savepoint=False):
+            rows = list(self.filter(LIVE).select_for_update().values_list("id", "author_id"))
+            if not rows:
+                return 0
+            
+            deleted = Book.all_objects.filter(id__in=[row[0] for row in rows]).update(
+                deleted_at=timezone.now()
+            )
+            Author.adjust_book_counts({
+                author_id: -count
+                for author_id, count in Counter(row[1] for row in rows).items()
+            })
+        return deleted
 
 
 class Author(models.Model):
     first_name = models.TextField()
     last_name = models.TextField()
     
+    # denormalized number of books, kept in step by books.signals
+    book_count = models.PositiveIntegerField(default=0, editable=False)
+    
+    # set by soft deletes, the row is moved to the archive later
+    deleted_at = models.DateTimeField(null=True, blank=True, editable=False)
+    
+    objects = LiveManager.from_queryset(AuthorQuerySet)()
+    all_objects = AuthorQuerySet.as_manager()
+    
     class Meta:
         verbose_name_plural = "Authors"
         db_table = "authors"
+        indexes = [
+            models.Index(fields=["last_name", "first_name"], name="authors_name_idx", condition=LIVE),
+            models.Index(fields=["first_name"], name="authors_first_name_idx", condition=LIVE),
+            models.Index(fields=["book_count"], name="authors_book_count_idx", condition=LIVE),
+            models.Index(fields=["deleted_at"], name="authors_deleted_at_idx", condition=DELETED),
+        ]
         
     def __str__(self) -> str:
         return f"{self.first_name} {self.last_name}"
+    
+    @staticmethod
+    def adjust_book_counts(deltas:Dict[int, int]) -> None:
+        """
+        This method applies book count changes to many authors in a single UPDATE
+        
+        :param deltas: The change in book count keyed by author id
+        :type deltas: Dict[int, int]
+        """
+        deltas = {author_id: delta for author_id, delta in deltas.items() if delta}
+        if not deltas:
+            return
+        
+        Author.objects.filter(id__in=deltas).update(
+            book_count=F("book_count") + Case(
+                *[When(id=author_id, then=Value(delta)) for author_id, delta in deltas.items()],
+                default=Value(0)
+            )
+        )
 
 
 class Book(models.Model):
@@ -18,9 +154,84 @@ class Book(models.Model):
     isbn = models.TextField()
     author = models.ForeignKey(Author, on_delete=models.CASCADE)
     
+    # set by soft deletes, the row is moved to the archive later
+    deleted_at = models.DateTimeField(null=True, blank=True, editable=False)
+    
+    objects = LiveManager.from_queryset(BookQuerySet)()
+    all_objects = BookQuerySet.as_manager()
+    
     class Meta:
         verbose_name_plural = "Books"
         db_table = "books"
+        indexes = [
+            models.Index(fields=["name"], name="books_name_idx", condition=LIVE),
+            models.Index(fields=["isbn"], name="books_isbn_idx", condition=LIVE),
+            models.Index(fields=["deleted_at"], name="books_deleted_at_idx", condition=DELETED),
+        ]
+        
+    def __str__(self) -> str:
+        return self.name
+
+
+class ArchivedAuthor(models.Model):
+    """Authors moved out of the authors table by the archive_deleted job"""
+    
+    id = models.IntegerField(primary_key=True)
+    first_name = models.TextField()
+    last_name = models.TextField()
+    deleted_at = models.DateTimeField()
+    archived_at = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        verbose_name_plural = "Archived authors"
+        db_table = "authors_archive"
+
+
+class ArchivedBook(models.Model):
+    """Books moved out of the books table by the archive_deleted job"""
+    
+    id = models.IntegerField(primary_key=True)
+    name = models.TextField()
+    isbn = models.TextField()
+    
+    # a plain id, the author may be archived or still live
+    author_id = models.IntegerField(db_index=True)
+    deleted_at = models.DateTimeField()
+    archived_at = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        verbose_name_plural = "Archived books"
+        db_table = "books_archive"
+
+
+class Job(models.Model):
+    
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        RUNNING = "running", "Running"
+        SUCCEEDED = "succeeded", "Succeeded"
+        FAILED = "failed", "Failed"
+    
+    name = models.TextField()
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.TextField(choices=Status.choices, default=Status.PENDING)
+    progress = models.FloatField(default=0)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    # the worker running the job, whose heartbeat keeps updated_at fresh
+    worker = models.TextField(blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    run_after = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name_plural = "Jobs"
+        db_table = "jobs"
+        indexes = [
+            models.Index(fields=["status", "run_after"], name="jobs_queue_idx"),
+        ]
         
     def __str__(self) -> str:
-        return self.name
\ No newline at end of file
+        return f"{self.name} #{self.pk} ({self.status})"
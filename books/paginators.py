@@ -0,0 +1,54 @@
+# Django Imports
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Max, QuerySet
+from django.utils.functional import cached_property
+
+
+def estimated_row_count(queryset:QuerySet) -> int:
+    """
+    This function estimates the number of rows in the table of a queryset
+    without scanning it: PostgreSQL reads the planner statistics and every
+    other backend reads the highest primary key from the index
+    
+    :param queryset: A queryset over the table to be estimated
+    :type queryset: QuerySet
+    :return: The estimated number of rows.
+    """
+    connection = connections[queryset.db]
+    
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE relname = %s",
+                [queryset.model._meta.db_table]
+            )
+            row = cursor.fetchone()
+        return max(row[0], 0) if row else 0
+    
+    return queryset.model._default_manager.using(queryset.db).aggregate(
+        estimate=Max("pk")
+    )["estimate"] or 0
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that replaces ``COUNT(*)`` with a table estimate when an
+    unfiltered queryset is larger than ``exact_count_threshold`` rows
+    """
+    
+    exact_count_threshold = 10000
+    
+    @cached_property
+    def count(self) -> int:
+        queryset = self.object_list
+        
+        # the live rows filter of the default manager still counts as unfiltered
+        if (
+            isinstance(queryset, QuerySet)
+            and queryset.query.where == queryset.model._default_manager.all().query.where
+        ):
+            estimate = estimated_row_count(queryset)
+            if estimate > self.exact_count_threshold:
+                return estimate
+        return super().count
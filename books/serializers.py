@@ -1,20 +1,34 @@
+# Django Imports
+from django.db import transaction
+
 # Rest Framework Imports
 from rest_framework import serializers
 
 # Own Imports
-from books.models import Author, Book
+from books.models import Author, Book, Job
+from books.exports import FILE_TYPES
+from books.isbn import InvalidISBN, canonical_isbn
+
+
+class ISBNField(serializers.CharField):
+    """Accepts any ISBN-10 or ISBN-13 form and validates it to the canonical ISBN-13"""
+    
+    def to_internal_value(self, data) -> str:
+        try:
+            return canonical_isbn(super().to_internal_value(data))
+        except InvalidISBN as error:
+            raise serializers.ValidationError(str(error))
 
 
 class AuthorSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Author
-        fields = ("id", "first_name", "last_name")      
+        fields = ("id", "first_name", "last_name", "book_count")      
+        read_only_fields = ("book_count", )
         
     def create(self, validated_data:dict):
-        author = Author.objects.create(**validated_data)
-        author.save()
-        return author
+        return Author.objects.create(**validated_data)
     
     def update(self, instance, validated_data):
         return super().update(instance, validated_data)
@@ -22,49 +36,277 @@ class AuthorSerializer(serializers.ModelSerializer):
 
 class BookSerializer(serializers.ModelSerializer):
     author = AuthorSerializer()
+    isbn = ISBNField()
     
     class Meta:
         model = Book
         fields = ("id", "name", "isbn", "author")
     
-    def create(self, validated_data:dict):
+    @staticmethod
+    def get_or_create_author(author_data:dict, current:Author = None) -> Author:
+        """
+        This method resolves the author of a book write, reusing the current
+        author when the names are unchanged so no lookup is issued
         
-        # get fields from validated data
-        _author = validated_data.get("author")
-        name = validated_data.get("name")
-        isbn = validated_data.get("isbn")
+        :param author_data: The validated first_name and last_name of the author
+        :type author_data: dict
+        :param current: The author currently attached to the book, if loaded
+        :type current: Author
+        :return: An Author object.
+        """
+        first_name = author_data.get("first_name")
+        last_name = author_data.get("last_name")
         
-        # gets or creates and save author object to database
-        try:
-            author = Author.objects.get(
-                first_name=_author.get("first_name"), 
-                last_name=_author.get("last_name")
-            )
-        except (Author.DoesNotExist, Exception):
-            author = Author.objects.create(
-                first_name=str(_author.get("first_name")).capitalize, 
-                last_name=str(_author.get("last_name")).capitalize
-            ).save()
+        if (
+            current is not None 
+            and current.first_name == first_name 
+            and current.last_name == last_name
+        ):
+            return current
+        
+        author = Author.objects.filter(
+            first_name=first_name, last_name=last_name
+        ).order_by("id").first()
         
-        # creates and save book object to database
-        book = Book.objects.create(name=name, isbn=isbn, author=author)
-        book.save()
-        return book
+        if author is None:
+            author = Author.objects.create(first_name=first_name, last_name=last_name)
+        return author
     
-    def update(self, instance, validated_data):
-        # get author data
+    def create(self, validated_data:dict):
         author_data = validated_data.pop("author")
         
-        # get fields from validated data
-        name = validated_data.get("name")
-        isbn = validated_data.get("isbn")
+        # one transaction for the author lookup/insert and the book insert
+        with transaction.atomic(savepoint=False):
+            author = self.get_or_create_author(author_data)
+            return Book.objects.create(author=author, **validated_data)
+    
+    def update(self, instance, validated_data):
+        author_data = validated_data.pop("author", None)
+        update_fields = list(validated_data)
+        
+        with transaction.atomic(savepoint=False):
+            if author_data is not None:
+                # only compare against the current author if it is already loaded
+                current = instance.author if Book.author.is_cached(instance) else None
+                author = self.get_or_create_author(author_data, current=current)
+                
+                if author.pk != instance.author_id:
+                    instance.author = author
+                    update_fields.append("author")
+            
+            for field, value in validated_data.items():
+                setattr(instance, field, value)
+            
+            # write only the changed columns in a single UPDATE
+            if update_fields:
+                instance.save(update_fields=update_fields)
+        return instance
+
+
+
+class BookFieldsSerializer(serializers.Serializer):
+    name = serializers.CharField(required=False)
+    isbn = ISBNField(required=False)
+    author_id = serializers.IntegerField(required=False, min_value=1)
+    
+    def validate(self, attrs:dict) -> dict:
+        if not attrs:
+            raise serializers.ValidationError("At least one field must be updated")
+        return attrs
+
+
+class BookPatchListSerializer(serializers.ListSerializer):
+    """
+    Applies a batch of partial book updates in one transaction, writing 
+    only the changed columns of every book through bulk_update
+    """
+    
+    max_items = 5000
+    
+    def to_internal_value(self, data) -> list:
+        if not isinstance(data, list):
+            raise serializers.ValidationError({
+                "non_field_errors": ["Expected a list of updates."]
+            })
+        if not data and not self.allow_empty:
+            raise serializers.ValidationError({
+                "non_field_errors": ["This list may not be empty."]
+            })
+        if len(data) > self.max_items:
+            raise serializers.ValidationError({
+                "non_field_errors": [f"Ensure there are no more than {self.max_items} updates."]
+            })
+        
+        attrs = []
+        errors = []
+        for item in data:
+            try:
+                attrs.append(self.child.run_validation(item))
+                errors.append({})
+            except serializers.ValidationError as error:
+                attrs.append(None)
+                errors.append(error.detail)
+        
+        valid = [item for item in attrs if item is not None]
+        
+        # one query for every book and one for every referenced author
+        book_ids = set(
+            Book.objects.filter(id__in=[item["id"] for item in valid]).values_list("id", flat=True)
+        )
+        self.check_rows(attrs, errors, book_ids, self.existing_authors(valid))
+        
+        seen = set()
+        for item, item_errors in zip(attrs, errors):
+            if item is None:
+                continue
+            if item["id"] in seen and "id" not in item_errors:
+                item_errors["id"] = ["Book is updated more than once!"]
+            seen.add(item["id"])
+        
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return attrs
+    
+    def existing_authors(self, items:list) -> set:
+        author_ids = {
+            item["fields"]["author_id"] for item in items if "author_id" in item["fields"]
+        }
+        if not author_ids:
+            return set()
+        return set(Author.objects.filter(id__in=author_ids).values_list("id", flat=True))
+    
+    def check_rows(self, items:list, errors:list, book_ids, author_ids:set) -> None:
+        # reports updates of missing books and reassignments to missing authors
+        for item, item_errors in zip(items, errors):
+            if item is None:
+                continue
+            
+            if item["id"] not in book_ids:
+                item_errors["id"] = ["Book does not exist!"]
+            
+            author_id = item["fields"].get("author_id")
+            if author_id is not None and author_id not in author_ids:
+                item_errors["fields"] = {"author_id": ["Author does not exist!"]}
+    
+    def save(self, **kwargs) -> list:
+        """
+        This method writes the validated updates. The books are read again
+        and locked in the transaction of the writes, so a book deleted or
+        reassigned since validation is neither written nor counted
+
+        :return: The updated books.
+        :raises ValidationError: When a book or author was deleted since validation
+        """
+        updates = self.validated_data
+        errors = [{} for _ in updates]
+        # books grouped by the set of columns that actually change
+        groups = {}
+        count_deltas = {}
         
-        # get or create author object to database
-        author, _ = Author.objects.get_or_create(**author_data)
+        with transaction.atomic(savepoint=False):
+            books = Book.objects.select_for_update().in_bulk([item["id"] for item in updates])
+            self.check_rows(updates, errors, books, self.existing_authors(updates))
+            
+            # nothing was written, the error is raised once the transaction is left
+            if not any(errors):
+                for item in updates:
+                    book = books[item["id"]]
+                    changed = [
+                        field for field, value in item["fields"].items()
+                        if getattr(book, field) != value
+                    ]
+                    
+                    if "author_id" in changed:
+                        count_deltas[book.author_id] = count_deltas.get(book.author_id, 0) - 1
+                        new_author_id = item["fields"]["author_id"]
+                        count_deltas[new_author_id] = count_deltas.get(new_author_id, 0) + 1
+                    
+                    for field in changed:
+                        setattr(book, field, item["fields"][field])
+                    
+                    if changed:
+                        groups.setdefault(tuple(sorted(changed)), []).append(book)
+                
+                for fields, changed_books in groups.items():
+                    Book.objects.bulk_update(changed_books, fields)
+                
+                # bulk_update sends no post_save, so count reassignments here
+                Author.adjust_book_counts(count_deltas)
         
-        # update book object to database
-        instance.author = author
-        instance.name = name
-        instance.isbn = isbn
-        instance.save()
-        return instance
\ No newline at end of file
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        
+        for changed_books in groups.values():
+            for book in changed_books:
+                book._saved_author_id = book.author_id
+        
+        self.instance = [book for changed_books in groups.values() for book in changed_books]
+        return self.instance
+
+
+class BookPatchSerializer(serializers.Serializer):
+    id = serializers.IntegerField(min_value=1)
+    fields = BookFieldsSerializer()
+    
+    class Meta:
+        list_serializer_class = BookPatchListSerializer
+
+
+class ImportBooksPayloadSerializer(serializers.Serializer):
+    # the books themselves are validated by the task, which reports invalid ones by index
+    books = serializers.ListField(child=serializers.DictField(), allow_empty=False)
+    batch_size = serializers.IntegerField(default=500, min_value=1, max_value=5000)
+
+
+class NormalizeISBNsPayloadSerializer(serializers.Serializer):
+    batch_size = serializers.IntegerField(default=1000, min_value=1, max_value=10000)
+
+
+class AnalyzePayloadSerializer(serializers.Serializer):
+    pass
+
+
+# Payloads of the tasks clients may queue. Periodic tasks like archive_deleted
+# are only queued by the worker, with their settings
+JOB_PAYLOADS = {
+    "import_books": ImportBooksPayloadSerializer,
+    "normalize_isbns": NormalizeISBNsPayloadSerializer,
+    "analyze": AnalyzePayloadSerializer,
+}
+
+
+class JobSerializer(serializers.ModelSerializer):
+    
+    class Meta:
+        model = Job
+        fields = (
+            "id", "name", "payload", "max_attempts", "status", "progress", 
+            "result", "error", "attempts", "created_at", "updated_at"
+        )
+        read_only_fields = (
+            "status", "progress", "result", "error", 
+            "attempts", "created_at", "updated_at"
+        )
+        extra_kwargs = {"max_attempts": {"min_value": 1, "max_value": 10}}
+    
+    def validate_name(self, name:str) -> str:
+        if name not in JOB_PAYLOADS:
+            raise serializers.ValidationError(
+                f"Unknown job, expected one of: {', '.join(sorted(JOB_PAYLOADS))}"
+            )
+        return name
+    
+    def validate(self, attrs:dict) -> dict:
+        payload = JOB_PAYLOADS[attrs["name"]](data=attrs.get("payload", {}))
+        if not payload.is_valid():
+            raise serializers.ValidationError({"payload": payload.errors})
+        
+        # unknown keys are dropped and defaults filled in
+        attrs["payload"] = payload.validated_data
+        return attrs
+
+
+
+class ExportSerializer(serializers.Serializer):
+    file_type = serializers.ChoiceField(choices=sorted(FILE_TYPES), default="csv")
+    batch_size = serializers.IntegerField(default=5000, min_value=100, max_value=100000)
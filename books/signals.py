@@ -0,0 +1,57 @@
+# Django Imports
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+# Own Imports
+from books.autocomplete import author_index
+from books.cache import bump_data_version
+from books.models import Author, Book
+
+
+@receiver(post_init, sender=Book)
+def remember_book_author(sender, instance:Book, **kwargs) -> None:
+    # the author the row was loaded or last saved with
+    instance._saved_author_id = instance.author_id
+
+
+@receiver(post_save, sender=Book)
+def count_saved_book(sender, instance:Book, created:bool, **kwargs) -> None:
+    if created:
+        Author.adjust_book_counts({instance.author_id: 1})
+    
+    elif instance.author_id != instance._saved_author_id:
+        # author reassignment moves the book between the two counts
+        Author.adjust_book_counts({
+            instance._saved_author_id: -1, instance.author_id: 1
+        })
+    
+    instance._saved_author_id = instance.author_id
+
+
+@receiver(post_delete, sender=Book)
+def count_deleted_book(sender, instance:Book, **kwargs) -> None:
+    # soft deleted books left the count when they were soft deleted
+    if instance.deleted_at is None:
+        Author.adjust_book_counts({instance._saved_author_id: -1})
+
+
+@receiver(post_save, sender=Author)
+@receiver(post_save, sender=Book)
+@receiver(post_delete, sender=Author)
+@receiver(post_delete, sender=Book)
+def bump_version(sender, instance, signal, **kwargs) -> None:
+    # invalidates the cached list responses built from the model, which
+    # never included the soft deleted rows the archive job deletes
+    if signal is post_save or instance.deleted_at is None:
+        bump_data_version(sender)
+
+
+@receiver(post_save, sender=Author)
+def index_saved_author(sender, instance:Author, **kwargs) -> None:
+    author_index.update(instance)
+
+
+@receiver(post_delete, sender=Author)
+def unindex_deleted_author(sender, instance:Author, **kwargs) -> None:
+    if instance.deleted_at is None:
+        author_index.update(instance, deleted=True)
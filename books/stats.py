@@ -0,0 +1,42 @@
+# Django Imports
+from django.conf import settings
+
+# Own Imports
+from books.cache import single_flight, write_rate
+from books.models import Author, Book
+from books.paginators import EstimatedCountPaginator, estimated_row_count
+
+
+STATS_TABLES = {"books": Book, "authors": Author}
+
+
+def table_count(model) -> int:
+    # counted like the admin does: exact for small tables, estimated for large ones
+    estimate = estimated_row_count(model.objects.all())
+    if estimate > EstimatedCountPaginator.exact_count_threshold:
+        return estimate
+    return model.objects.count()
+
+
+def table_counts() -> dict:
+    return {table: table_count(model) for table, model in STATS_TABLES.items()}
+
+
+def catalogue_stats() -> dict:
+    """
+    This function returns the row count and recent write rate of each table.
+    Counts are cached for ``STATS_CACHE_TIMEOUT`` seconds and computed by a
+    single request when they expire; write rates are read from the per minute
+    write counters of books.cache
+
+    :return: The count and writes_per_minute keyed by table.
+    """
+    counts = single_flight("stats:counts", table_counts, settings.STATS_CACHE_TIMEOUT)
+
+    return {
+        table: {
+            "count": counts[table],
+            "writes_per_minute": round(write_rate(model._meta.label_lower), 2),
+        }
+        for table, model in STATS_TABLES.items()
+    }
@@ -0,0 +1,89 @@
+# Django Imports
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+# Own Imports
+from books.models import Author, Book
+from books.paginators import EstimatedCountPaginator
+
+
+class EstimatedCountPaginatorTestCase(TestCase):
+    """Test case for the estimated count admin paginator"""
+
+    def setUp(self) -> None:
+        author = Author.objects.create(first_name="John", last_name="Doe")
+        for index in range(5):
+            Book.objects.create(name=f"Book {index}", isbn=str(index), author=author)
+
+    def test_exact_count_below_threshold(self):
+        """
+        Test that small tables are counted exactly
+
+        :return: The exact number of books
+        """
+        paginator = EstimatedCountPaginator(Book.objects.order_by("id"), 2)
+        self.assertEqual(paginator.count, 5)
+
+    def test_estimated_count_above_threshold(self):
+        """
+        Test that unfiltered tables above the threshold are estimated
+        from the primary key index instead of a COUNT(*)
+
+        :return: The estimated number of books
+        """
+        Book.objects.filter(name="Book 0").delete()
+        paginator = EstimatedCountPaginator(Book.objects.order_by("id"), 2)
+        paginator.exact_count_threshold = 1
+
+        last_id = Book.objects.order_by("-id").first().id
+
+        with self.assertNumQueries(1) as context:
+            self.assertEqual(paginator.count, last_id)
+        self.assertNotIn("COUNT", context.captured_queries[0]["sql"].upper())
+
+    def test_filtered_queryset_counted_exactly(self):
+        """
+        Test that filtered querysets are always counted exactly
+
+        :return: The exact number of matching books
+        """
+        paginator = EstimatedCountPaginator(Book.objects.filter(isbn="1").order_by("id"), 2)
+        paginator.exact_count_threshold = 1
+        self.assertEqual(paginator.count, 1)
+
+
+class BookAdminTestCase(TestCase):
+    """Test case for the book admin changelist"""
+
+    def setUp(self) -> None:
+        user = get_user_model().objects.create_superuser("admin", "admin@example.com", "password")
+        self.client.force_login(user)
+
+        for index in range(10):
+            author = Author.objects.create(first_name="John", last_name=f"Doe {index}")
+            Book.objects.create(name=f"Glitch {index}", isbn=f"isbn-{index}", author=author)
+        Book.objects.create(name="Clean Code", isbn="0132350882", author=author)
+
+    def test_changelist_queries_do_not_grow_with_rows(self):
+        """
+        Test that the changelist loads authors with the books
+        instead of one query per row
+
+        :return: A response status_code 200 within a fixed number of queries
+        """
+        with self.assertNumQueries(5):
+            response = self.client.get(reverse("admin:books_book_changelist"))
+        self.assertEqual(response.status_code, 200)
+
+    def test_changelist_search(self):
+        """
+        Test that search matches book names by prefix and isbn exactly
+
+        :return: The matching books in the changelist
+        """
+        response = self.client.get(reverse("admin:books_book_changelist"), {"q": "Clean"})
+        self.assertEqual(list(response.context["cl"].result_list.values_list("name", flat=True)), ["Clean Code"])
+
+        response = self.client.get(reverse("admin:books_book_changelist"), {"q": "isbn-3"})
+        self.assertEqual(list(response.context["cl"].result_list.values_list("name", flat=True)), ["Glitch 3"])
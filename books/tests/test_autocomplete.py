@@ -0,0 +1,126 @@
+# Native Imports
+import json
+
+# Django Imports
+from django.test import override_settings
+from django.urls import reverse
+
+# Rest Framework Imports
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+# Own Imports
+from books.autocomplete import author_index, search_queryset
+from books.models import Author
+
+
+# Initialize api client
+client = APIClient()
+
+
+class AuthorAutocompleteTestCase(APITestCase):
+    """Test case to autocomplete author names"""
+
+    def setUp(self) -> None:
+        self.martin = Author.objects.create(first_name="Robert", last_name="Martin")
+        self.fowler = Author.objects.create(first_name="Martin", last_name="Fowler")
+        self.muller = Author.objects.create(first_name="Jürgen", last_name="Müller")
+        Author.objects.create(first_name="Kent", last_name="Beck")
+
+    def names(self, query:str, **params) -> list:
+        response = client.get(reverse("authors_autocomplete"), {"q": query, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [f"{author['first_name']} {author['last_name']}" for author in response.data["data"]]
+
+    def test_prefix_of_any_name(self):
+        """
+        Test that authors are matched by a prefix of their first, last or
+        full name, ignoring case and accents, each author once
+
+        :return: A response object with the matching authors and status_code 200
+        """
+        self.assertEqual(self.names("mar"), ["Robert Martin", "Martin Fowler"])
+        self.assertEqual(self.names("ROBERT M"), ["Robert Martin"])
+        self.assertEqual(self.names("mul"), ["Jürgen Müller"])
+        self.assertEqual(self.names("mar", limit=1), ["Robert Martin"])
+        self.assertEqual(self.names("zz"), [])
+
+    def test_index_serves_without_queries(self):
+        """
+        Test that once built the index answers without touching the db
+
+        :return: A response object with the matching authors
+        """
+        self.names("mar")
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.names("kent"), ["Kent Beck"])
+
+    def test_index_follows_author_writes(self):
+        """
+        Test that renamed, created and deleted authors are reflected
+        in the index without rebuilding it
+
+        :return: A response object with the matching authors
+        """
+        self.names("mar")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            client.put(
+                reverse("author", args=[self.fowler.id]), content_type="application/json",
+                data=json.dumps({"first_name": "Martina", "last_name": "Fowler"}),
+            )
+        with self.captureOnCommitCallbacks(execute=True):
+            Author.objects.create(first_name="Margaret", last_name="Hamilton")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.martin.delete()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.names("mar"), ["Margaret Hamilton", "Martina Fowler"])
+
+    def test_index_rebuilds_after_bulk_writes(self):
+        """
+        Test that bulk created authors, which send no signals,
+        make the index rebuild
+
+        :return: A response object with the matching authors
+        """
+        self.names("mar")
+        Author.objects.bulk_create([Author(first_name="Marijn", last_name="Haverbeke")])
+
+        self.assertIn("Marijn Haverbeke", self.names("mar"))
+
+    @override_settings(AUTOCOMPLETE_INDEX_MAX_AUTHORS=2)
+    def test_database_fallback(self):
+        """
+        Test that tables too large for the index are searched with
+        a single indexed prefix query, once the index found it too large
+
+        :return: A response object with the matching authors
+        """
+        author_index.version = None
+        self.names("kent")
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self.names("mar"), ["Martin Fowler", "Robert Martin"])
+        with self.assertNumQueries(1):
+            self.assertEqual(self.names("Robert Ma"), ["Robert Martin"])
+
+    def test_database_fallback_uses_indexes(self):
+        """
+        Test that the fallback query is served by the name indexes
+
+        :return: A query plan without a scan of the authors table
+        """
+        plan = search_queryset("Robert Ma").explain()
+
+        self.assertNotIn("SCAN authors\n", plan + "\n")
+
+    def test_query_is_required(self):
+        """
+        Test that a missing query is rejected
+
+        :return: A response status_code 400
+        """
+        response = client.get(reverse("authors_autocomplete"))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
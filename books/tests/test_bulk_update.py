@@ -0,0 +1,147 @@
+# Native Imports
+import json
+
+# Django Imports
+from django.urls import reverse
+
+# Rest Framework Imports
+from rest_framework import serializers, status
+from rest_framework.test import APIClient, APITestCase
+
+# Own Imports
+from books.models import Author, Book
+from books.serializers import BookPatchSerializer
+
+
+# Initialize api client
+client = APIClient()
+
+
+class BulkPatchBooksTestCase(APITestCase):
+    """Test case to partially update many books at once"""
+
+    def setUp(self) -> None:
+        self.author = Author.objects.create(first_name="Robret", last_name="Martin")
+        self.corrected_author = Author.objects.create(first_name="Robert", last_name="Martin")
+        self.books = [
+            Book.objects.create(name=f"Clean Code {index}", isbn="9780132350884", author=self.author)
+            for index in range(5)
+        ]
+
+    def patch(self, updates:list):
+        return client.patch(
+            reverse("books"), data=json.dumps(updates), content_type="application/json"
+        )
+
+    def test_reassign_many_books_to_corrected_author(self):
+        """
+        Test that reassigning many books costs a fixed number of queries
+        and moves the book counts between the authors
+
+        :return: A response status_code 200 with the number of updated books
+        """
+        updates = [
+            {"id": book.id, "fields": {"author_id": self.corrected_author.id}}
+            for book in self.books
+        ]
+
+        # book and author lookups when validating, again under lock when
+        # saving, then the bulk UPDATE and the book count UPDATE
+        with self.assertNumQueries(6):
+            response = self.patch(updates)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["data"], {"updated": 5})
+        self.assertEqual(Book.objects.filter(author=self.corrected_author).count(), 5)
+
+        self.author.refresh_from_db()
+        self.corrected_author.refresh_from_db()
+        self.assertEqual((self.author.book_count, self.corrected_author.book_count), (0, 5))
+
+    def test_only_changed_columns_are_written(self):
+        """
+        Test that each book only has its changed columns written
+        and unchanged values issue no write at all
+
+        :return: A response status_code 200 with the number of changed books
+        """
+        updates = [
+            {"id": self.books[0].id, "fields": {"name": "Clean Code", "isbn": "0-13-235088-2"}},
+            {"id": self.books[1].id, "fields": {"name": "Clean Coder"}},
+        ]
+
+        # book lookups and one UPDATE, the unchanged isbn is not written
+        with self.assertNumQueries(3) as context:
+            response = self.patch(updates)
+
+        self.assertEqual(response.data["data"], {"updated": 2})
+        update_sql = context.captured_queries[2]["sql"]
+        self.assertIn('"name"', update_sql)
+        self.assertNotIn('"isbn" =', update_sql)
+        self.assertNotIn('"author_id" =', update_sql)
+
+        self.books[0].refresh_from_db()
+        self.assertEqual(self.books[0].name, "Clean Code")
+
+    def test_invalid_updates_report_errors_per_item(self):
+        """
+        Test that invalid updates are reported by position and that
+        nothing is written when any update is invalid
+
+        :return: A response status_code 400 with errors aligned to the input
+        """
+        response = self.patch([
+            {"id": self.books[0].id, "fields": {"name": "Clean Code"}},
+            {"id": 53, "fields": {"name": "Missing"}},
+            {"id": self.books[1].id, "fields": {"author_id": 53}},
+            {"id": self.books[2].id, "fields": {"isbn": "123"}},
+        ])
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        errors = response.data["message"]
+        self.assertEqual(errors[0], {})
+        self.assertIn("id", errors[1])
+        self.assertIn("author_id", errors[2]["fields"])
+        self.assertIn("isbn", errors[3]["fields"])
+
+        self.books[0].refresh_from_db()
+        self.assertEqual(self.books[0].name, "Clean Code 0")
+
+    def test_empty_update_is_rejected(self):
+        """
+        Test that an empty list and an update without fields are rejected
+
+        :return: A response status_code 400
+        """
+        self.assertEqual(self.patch([]).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            self.patch([{"id": self.books[0].id, "fields": {}}]).status_code,
+            status.HTTP_400_BAD_REQUEST
+        )
+
+    def test_book_deleted_after_validation_is_not_counted(self):
+        """
+        Test that a book deleted between validation and saving is
+        reported and that no update or book count change is written
+
+        :return: A validation error for the deleted book
+        """
+        serializer = BookPatchSerializer(
+            data=[
+                {"id": self.books[0].id, "fields": {"author_id": self.corrected_author.id}},
+                {"id": self.books[1].id, "fields": {"author_id": self.corrected_author.id}},
+            ],
+            many=True
+        )
+        self.assertTrue(serializer.is_valid())
+
+        Book.objects.filter(id=self.books[0].id).soft_delete()
+
+        with self.assertRaises(serializers.ValidationError) as context:
+            serializer.save()
+        self.assertIn("id", context.exception.detail[0])
+
+        self.author.refresh_from_db()
+        self.corrected_author.refresh_from_db()
+        self.assertEqual((self.author.book_count, self.corrected_author.book_count), (4, 0))
+        self.assertEqual(Book.objects.filter(author=self.author).count(), 4)
@@ -0,0 +1,178 @@
+# Native Imports
+import json
+import tempfile
+import threading
+import time
+from unittest import mock
+
+# Django Imports
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+
+# Rest Framework Imports
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+# Own Imports
+from books.cache import cache_lock, count_write, single_flight, write_rate
+from books.models import Author, Book
+
+
+# Initialize api client
+client = APIClient()
+
+
+class ResponseCacheTestCase(APITestCase):
+    """Test case to cache the list endpoints until their data changes"""
+
+    def setUp(self) -> None:
+        self.author = Author.objects.create(first_name="Robert", last_name="Martin")
+        self.book = Book.objects.create(
+            name="Clean Code", isbn="9780132350884", author=self.author
+        )
+
+    def test_repeated_list_is_served_from_cache(self):
+        """
+        Test that listing the books again runs no queries and
+        returns the same data, per set of query parameters
+
+        :return: The same response status_code 200 twice
+        """
+        first = client.get(reverse("books"))
+
+        with self.assertNumQueries(0):
+            second = client.get(reverse("books"))
+
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(first.data, second.data)
+
+        with self.assertNumQueries(1):
+            client.get(reverse("books"), {"name": "Clean"})
+
+    def test_writes_invalidate_cached_lists(self):
+        """
+        Test that creating, updating, bulk patching and deleting books
+        invalidate the books list and the book counts of the authors list
+
+        :return: Lists reflecting every write
+        """
+        client.get(reverse("books"))
+        client.get(reverse("authors"))
+
+        Book.objects.create(name="Clean Architecture", isbn="9780134494166", author=self.author)
+        self.assertEqual(len(client.get(reverse("books")).data["data"]), 2)
+        self.assertEqual(client.get(reverse("authors")).data["data"][0]["book_count"], 2)
+
+        client.patch(
+            reverse("books"), content_type="application/json",
+            data=json.dumps([{"id": self.book.id, "fields": {"name": "Clean Code 2"}}]),
+        )
+        names = {book["name"] for book in client.get(reverse("books")).data["data"]}
+        self.assertIn("Clean Code 2", names)
+
+        self.book.delete()
+        self.assertEqual(len(client.get(reverse("books")).data["data"]), 1)
+        self.assertEqual(client.get(reverse("authors")).data["data"][0]["book_count"], 1)
+
+    def test_errors_are_not_cached(self):
+        """
+        Test that invalid filters are answered but never cached
+
+        :return: A response status_code 400 each time
+        """
+        for _ in range(2):
+            response = client.get(reverse("books"), {"ordering": "isbn"})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_concurrent_misses_build_once(self):
+        """
+        Test that concurrent misses on one key wait for a single build
+
+        :return: The built value for every caller
+        """
+        builds = []
+
+        def build():
+            builds.append(1)
+            time.sleep(0.2)
+            return "built"
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(single_flight("stampede", build, 60)))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, ["built"] * 8)
+        self.assertEqual(len(builds), 1)
+
+
+class FileCacheLockTestCase(SimpleTestCase):
+    """Test case to lock the file cache shared by the workers of a host"""
+
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+
+        file_cache = override_settings(CACHES={"default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": directory.name,
+        }})
+        file_cache.enable()
+        self.addCleanup(file_cache.disable)
+
+    def test_lock_is_held_across_open_files(self):
+        """
+        Test that a key locked through one lock file cannot be locked
+        through another, as from a second worker process
+
+        :return: The lock taken once, then again after its release
+        """
+        with cache_lock("stampede", 1) as first:
+            with cache_lock("stampede", 0.1) as second:
+                self.assertTrue(first)
+                self.assertFalse(second)
+
+        with cache_lock("stampede", 0.1) as third:
+            self.assertTrue(third)
+
+    def test_concurrent_writes_are_all_counted(self):
+        """
+        Test that writes counted at once are not lost in the two
+        steps the file cache increments a count with
+
+        :return: The rate of every counted write
+        """
+        threads = [
+            threading.Thread(target=lambda: [count_write("books.book") for _ in range(25)])
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # two minutes, in case the writes straddled a minute boundary
+        with self.settings(STATS_WRITE_WINDOW=2):
+            self.assertEqual(write_rate("books.book"), 100)
+
+    def test_lock_without_flock(self):
+        """
+        Test that platforms without fcntl, like Windows, lock the file
+        cache with the add lock instead
+
+        :return: The lock taken once
+        """
+        with mock.patch("books.cache.fcntl", None):
+            with cache_lock("stampede", 1) as first:
+                with cache_lock("stampede", 0.1) as second:
+                    self.assertTrue(first)
+                    self.assertFalse(second)
+
+            count_write("books.book")
+            with self.settings(STATS_WRITE_WINDOW=2):
+                self.assertEqual(write_rate("books.book"), 0.5)
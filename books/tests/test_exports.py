@@ -0,0 +1,117 @@
+# Native Imports
+import csv
+import io
+import json
+import os
+import tempfile
+import unittest
+
+# Django Imports
+from django.core.management import call_command
+from django.urls import reverse
+
+# Rest Framework Imports
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+# Own Imports
+from books.exports import pyarrow
+from books.models import Author, Book
+
+
+# Initialize api client
+client = APIClient()
+
+
+class ExportTestCase(APITestCase):
+    """Test case to export the catalogue in columnar file types"""
+
+    def setUp(self) -> None:
+        authors = [
+            Author.objects.create(first_name="Robert", last_name=f"Martin {index}")
+            for index in range(3)
+        ]
+        for index in range(300):
+            Book.objects.create(
+                name=f"Clean Code Volume {index}", isbn="9780132350884",
+                author=authors[index % 3]
+            )
+
+    def export(self, table:str, **params) -> bytes:
+        response = client.get(reverse("export", args=[table]), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return b"".join(response.streaming_content)
+
+    def test_csv_export_references_authors_by_id(self):
+        """
+        Test that the books csv export has one row per book with the
+        author id instead of the nested author, and is smaller than JSON
+
+        :return: A csv file of every book
+        """
+        content = self.export("books", file_type="csv", batch_size=100)
+        rows = list(csv.reader(io.StringIO(content.decode())))
+
+        self.assertEqual(rows[0], ["id", "name", "isbn", "author_id"])
+        self.assertEqual(len(rows), 301)
+        self.assertEqual(rows[1][1], "Clean Code Volume 0")
+
+        books_json = json.dumps(client.get(reverse("books")).data["data"]).encode()
+        self.assertLess(len(content) * 2, len(books_json))
+
+    def test_csv_export_of_empty_table(self):
+        """
+        Test that an empty table exports its header only
+
+        :return: A csv file with the header row
+        """
+        Book.objects.all().delete()
+        self.assertEqual(self.export("books").decode().strip(), "id,name,isbn,author_id")
+
+    @unittest.skipIf(pyarrow is None, "pyarrow is not installed")
+    def test_arrow_and_parquet_exports(self):
+        """
+        Test that the Arrow IPC stream and Parquet exports read back
+        into the same rows, one batch or row group per cursor batch
+
+        :return: Arrow and Parquet files of every book
+        """
+        import pyarrow.parquet
+
+        table = pyarrow.ipc.open_stream(self.export("books", file_type="arrow", batch_size=100)).read_all()
+        self.assertEqual(table.num_rows, 300)
+        self.assertEqual(table.column("name")[0].as_py(), "Clean Code Volume 0")
+
+        parquet = pyarrow.parquet.ParquetFile(
+            pyarrow.BufferReader(self.export("books", file_type="parquet", batch_size=100))
+        )
+        self.assertEqual(parquet.metadata.num_rows, 300)
+        self.assertEqual(parquet.metadata.num_row_groups, 3)
+
+    def test_invalid_export(self):
+        """
+        Test that unknown tables and file types are rejected
+
+        :return: A response status_code 404 and a response status_code 400
+        """
+        response = client.get(reverse("export", args=["users"]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        response = client.get(reverse("export", args=["books"]), {"file_type": "xlsx"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_command_writes_file(self):
+        """
+        Test that the export command writes the authors table to a file
+
+        :return: A csv file of every author
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "authors.csv")
+            call_command("export_catalogue", "authors", output=path, stderr=io.StringIO())
+
+            with open(path) as output:
+                rows = list(csv.reader(output))
+
+        self.assertEqual(rows[0], ["id", "first_name", "last_name", "book_count"])
+        self.assertEqual(rows[1][3], "100")
@@ -0,0 +1,128 @@
+# Django Imports
+from django.urls import reverse
+
+# Rest Framework Imports
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+# Own Imports
+from books.models import Author, Book
+from books.filters import AuthorFilterSerializer, BookFilterSerializer
+
+
+# Initialize api client
+client = APIClient()
+
+
+class BookFilterTestCase(APITestCase):
+    """Test case to filter and order the books api"""
+
+    def setUp(self) -> None:
+        self.author = Author.objects.create(first_name="Robert", last_name="Martin")
+        self.other_author = Author.objects.create(first_name="John", last_name="Doe")
+        Book.objects.create(name="Clean Code", isbn="0132350882", author=self.author)
+        Book.objects.create(name="Clean Architecture", isbn="0134494164", author=self.author)
+        Book.objects.create(name="Glitch", isbn="1256841190", author=self.other_author)
+
+    def test_filter_books_by_author(self):
+        """
+        Test that only the books of the given author are returned
+
+        :return: A response object with the author's books and status_code 200
+        """
+        response = client.get(reverse("books"), {"author_id": self.other_author.id})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([book["name"] for book in response.data["data"]], ["Glitch"])
+
+    def test_filter_books_by_name_prefix_and_order(self):
+        """
+        Test that books are matched by name prefix and ordered by name
+
+        :return: A response object with the matching books and status_code 200
+        """
+        response = client.get(reverse("books"), {"name": "Clean", "ordering": "name"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [book["name"] for book in response.data["data"]],
+            ["Clean Architecture", "Clean Code"]
+        )
+
+    def test_filter_books_invalid_params(self):
+        """
+        Test that an ordering outside the whitelist is rejected
+
+        :return: A response status_code 400
+        """
+        response = client.get(reverse("books"), {"ordering": "isbn"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = client.get(reverse("books"), {"author_id": "abc"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_filter_authors_by_last_name_prefix(self):
+        """
+        Test that authors are matched by last name prefix
+
+        :return: A response object with the matching authors and status_code 200
+        """
+        response = client.get(reverse("authors"), {"last_name": "Mar", "ordering": "last_name"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([author["id"] for author in response.data["data"]], [self.author.id])
+
+
+class FilterQueryPlanTestCase(APITestCase):
+    """Test case asserting every whitelisted filter is served by an index"""
+
+    def get_plan(self, filter_class, queryset, params:dict) -> str:
+        filters = filter_class(data=params)
+        self.assertTrue(filters.is_valid(), filters.errors)
+        return filters.filter_queryset(queryset).explain()
+
+    def assert_uses_index(self, plan:str):
+        self.assertIn("USING", plan)
+        self.assertNotIn("SCAN books\n", plan + "\n")
+        self.assertNotIn("SCAN authors\n", plan + "\n")
+        self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_book_filters_use_index(self):
+        """
+        Test that every book filter searches an index instead of scanning the table
+
+        :return: A query plan without full table scans
+        """
+        for params in ({"author_id": 1}, {"isbn": "0132350882"}, {"name": "Clean"}):
+            with self.subTest(params=params):
+                plan = self.get_plan(BookFilterSerializer, Book.objects.all(), params)
+                self.assertIn("SEARCH", plan)
+                self.assert_uses_index(plan)
+
+    def test_book_ordering_uses_index(self):
+        """
+        Test that every book ordering is read from an index without a sort step
+
+        :return: A query plan without temporary sort b-trees
+        """
+        for ordering in ("name", "-name", "id", "-id"):
+            with self.subTest(ordering=ordering):
+                plan = self.get_plan(BookFilterSerializer, Book.objects.all(), {"ordering": ordering})
+                self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_author_filters_use_index(self):
+        """
+        Test that the author filters and orderings are served by an index
+
+        :return: A query plan without full table scans or sort steps
+        """
+        for params in ({"last_name": "Mar"}, {"min_books": 2}):
+            with self.subTest(params=params):
+                plan = self.get_plan(AuthorFilterSerializer, Author.objects.all(), params)
+                self.assertIn("SEARCH", plan)
+                self.assert_uses_index(plan)
+
+        for ordering in ("last_name", "-last_name", "book_count", "-book_count", "id", "-id"):
+            with self.subTest(ordering=ordering):
+                plan = self.get_plan(AuthorFilterSerializer, Author.objects.all(), {"ordering": ordering})
+                self.assertNotIn("TEMP B-TREE", plan)
@@ -0,0 +1,109 @@
+# Native Imports
+import threading
+from unittest import mock
+
+# Django Imports
+from django.db import OperationalError
+from django.test import override_settings
+from django.urls import reverse
+
+# Rest Framework Imports
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+# Own Imports
+from books.models import Author, Book
+
+
+# Initialize api client
+client = APIClient()
+
+
+class HealthCheckTestCase(APITestCase):
+    """Test case to probe the liveness and readiness of the app"""
+
+    def test_healthz_skips_middleware_and_database(self):
+        """
+        Test that the liveness probe is answered before the other
+        middleware run and without touching the db
+
+        :return: A response status_code 200
+        """
+        with self.assertNumQueries(0):
+            response = client.get("/healthz")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), {"status": "ok"})
+        self.assertNotIn("X-Frame-Options", response)
+
+    def test_readyz_pings_database(self):
+        """
+        Test that the readiness probe reports a reachable db
+
+        :return: A response status_code 200
+        """
+        response = client.get("/readyz")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), {"status": "ok", "database": "ok"})
+
+    def test_readyz_reports_database_errors(self):
+        """
+        Test that the readiness probe fails when the db raises
+
+        :return: A response status_code 503
+        """
+        with mock.patch("core.health.ping_database", side_effect=OperationalError):
+            with self.assertLogs("core.health", "ERROR"):
+                response = client.get("/readyz")
+
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response.json()["database"], "error")
+
+    @override_settings(READINESS_TIMEOUT=0.05)
+    def test_readyz_times_out(self):
+        """
+        Test that the readiness probe fails when the db does not answer
+        in time, without queueing pings behind the hanging one
+
+        :return: A response status_code 503
+        """
+        answered = threading.Event()
+
+        with mock.patch("core.health.ping_database", side_effect=answered.wait) as ping:
+            try:
+                for _ in range(2):
+                    with self.assertLogs("core.health", "WARNING"):
+                        response = client.get("/readyz")
+                    self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+                    self.assertEqual(response.json()["database"], "timeout")
+            finally:
+                answered.set()
+
+        self.assertEqual(ping.call_count, 1)
+
+
+class StatsTestCase(APITestCase):
+    """Test case to report the table counts and write rates"""
+
+    def setUp(self) -> None:
+        author = Author.objects.create(first_name="Robert", last_name="Martin")
+        for index in range(3):
+            Book.objects.create(name=f"Clean Code {index}", isbn="9780132350884", author=author)
+
+    def test_stats_counts_and_write_rates(self):
+        """
+        Test that the stats report every table with its count and recent
+        writes, and serve the counts from the cache afterwards
+
+        :return: A response status_code 200 with the stats of each table
+        """
+        response = client.get(reverse("stats"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["data"]["books"]["count"], 3)
+        self.assertEqual(response.data["data"]["authors"]["count"], 1)
+        self.assertGreater(response.data["data"]["books"]["writes_per_minute"], 0)
+
+        with self.assertNumQueries(0):
+            client.get(reverse("stats"))
@@ -0,0 +1,164 @@
+# Native Imports
+import json
+
+# Django Imports
+from django.test import SimpleTestCase
+from django.urls import reverse
+
+# Rest Framework Imports
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+# Own Imports
+from books.isbn import InvalidISBN, canonical_isbn, canonical_isbns
+from books.jobs import claim_job, enqueue, run_job
+from books.models import Author, Book
+
+
+# Initialize api client
+client = APIClient()
+
+
+class CanonicalISBNTestCase(SimpleTestCase):
+    """Test case for ISBN validation and canonicalization"""
+
+    def test_equivalent_forms_share_one_canonical_isbn(self):
+        """
+        Test that ISBN-10 and ISBN-13 forms, with or without
+        separators, canonicalize to the same ISBN-13
+
+        :return: The canonical ISBN-13
+        """
+        for value in ("0132350882", "0-13-235088-2", "978-0-13-235088-4", " 9780132350884 "):
+            with self.subTest(value=value):
+                self.assertEqual(canonical_isbn(value), "9780132350884")
+
+        self.assertEqual(canonical_isbn("0-8044-2957-x"), "9780804429573")
+
+    def test_invalid_isbns_are_rejected(self):
+        """
+        Test that wrong checksums, lengths, prefixes and non-ASCII digits are rejected
+
+        :return: An InvalidISBN error for every value
+        """
+        for value in (
+            "0132350883", "9780132350885", "123", "9770132350884", "01323508X2",
+            "²" * 10, "978" + "²" * 10, "٠١٣٢٣٥٠٨٨٢",
+        ):
+            with self.subTest(value=value):
+                with self.assertRaises(InvalidISBN):
+                    canonical_isbn(value)
+
+    def test_batch_canonicalization(self):
+        """
+        Test that the batch normalizer keeps input order and
+        returns None for invalid values instead of raising
+
+        :return: The canonical ISBN-13s with None for invalid values
+        """
+        self.assertEqual(
+            canonical_isbns(["0132350882", "garbage", "9780137081073"]),
+            ["9780132350884", None, "9780137081073"]
+        )
+
+
+class BookByISBNTestCase(APITestCase):
+    """Test case to store canonical ISBNs and look books up by any ISBN form"""
+
+    def setUp(self) -> None:
+        self.author = Author.objects.create(first_name="Robert", last_name="Martin")
+        self.book = Book.objects.create(name="Clean Code", isbn="9780132350884", author=self.author)
+
+    def test_create_book_stores_canonical_isbn(self):
+        """
+        Test that a book created with a hyphenated ISBN-10 is stored as ISBN-13
+
+        :return: A response status_code 201 with the canonical ISBN
+        """
+        response = client.post(
+            reverse("create_book"),
+            data=json.dumps({
+                "name": "The Clean Coder", "isbn": "0-13-708107-3",
+                "author": {"first_name": "Robert", "last_name": "Martin"}
+            }),
+            content_type="application/json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["data"]["isbn"], "9780137081073")
+
+    def test_create_book_with_invalid_isbn(self):
+        """
+        Test that a book with a wrong ISBN checksum or non-ASCII digits is rejected
+
+        :return: A response status_code 400
+        """
+        response = client.post(
+            reverse("create_book"),
+            data=json.dumps({
+                "name": "The Clean Coder", "isbn": "0137081074",
+                "author": {"first_name": "Robert", "last_name": "Martin"}
+            }),
+            content_type="application/json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = client.post(
+            reverse("create_book"),
+            data=json.dumps({
+                "name": "The Clean Coder", "isbn": "978" + "²" * 10,
+                "author": {"first_name": "Robert", "last_name": "Martin"}
+            }),
+            content_type="application/json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_get_book_by_any_isbn_form(self):
+        """
+        Test that the book is found by its ISBN-10 and ISBN-13 forms
+        with a single indexed query
+
+        :return: A response object with the book and status_code 200
+        """
+        for isbn in ("0132350882", "978-0-13-235088-4"):
+            with self.subTest(isbn=isbn):
+                with self.assertNumQueries(1):
+                    response = client.get(reverse("book_by_isbn", args=[isbn]))
+
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertEqual(response.data["data"]["id"], self.book.id)
+
+        plan = Book.objects.filter(isbn="9780132350884").explain()
+        self.assertIn("USING INDEX books_isbn_idx", plan)
+
+    def test_get_book_by_isbn_not_found_or_invalid(self):
+        """
+        Test that an unknown ISBN is not found and an invalid one is rejected
+
+        :return: A response status_code 404 and a response status_code 400
+        """
+        response = client.get(reverse("book_by_isbn", args=["9780137081073"]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        response = client.get(reverse("book_by_isbn", args=["not-an-isbn"]))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = client.get(reverse("book_by_isbn", args=["²" * 10]))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_normalize_isbns_job_backfills_legacy_rows(self):
+        """
+        Test that the backfill job rewrites legacy ISBNs in canonical
+        form and reports the rows it cannot repair
+
+        :return: A job result with the updated and invalid rows
+        """
+        legacy = Book.objects.create(name="The Clean Coder", isbn="0-13-708107-3", author=self.author)
+        broken = Book.objects.create(name="Glitch", isbn="1256841190", author=self.author)
+
+        job = enqueue("normalize_isbns", {"batch_size": 2})
+        run_job(claim_job().id)
+        job.refresh_from_db()
+
+        self.assertEqual(job.result, {"updated": 1, "invalid": 1, "invalid_ids": [broken.id]})
+        legacy.refresh_from_db()
+        self.assertEqual(legacy.isbn, "9780137081073")
@@ -0,0 +1,335 @@
+# Native Imports
+import json
+import os
+import signal
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+# Django Imports
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+# Rest Framework Imports
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+# Own Imports
+from books.jobs import TASKS, Task, claim_job, enqueue, heartbeat, requeue_stale_jobs, run_job
+from books.models import Author, Book, Job
+
+
+# Initialize api client
+client = APIClient()
+
+
+def failing_task(job, payload):
+    raise RuntimeError("boom")
+
+
+def terminated_task(job, payload):
+    # the worker is sent SIGTERM, as on a deploy, while the job runs
+    os.kill(os.getpid(), signal.SIGTERM)
+
+
+class BrokenPool:
+    """A process pool whose children die before running their job"""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def submit(self, *args):
+        future = Future()
+        future.set_exception(BrokenProcessPool("A child process terminated abruptly"))
+        return future
+
+    def shutdown(self, wait=True):
+        # the signature of Python 3.8, without cancel_futures
+        pass
+
+
+class JobAPITestCase(APITestCase):
+    """Test case to queue and poll background jobs"""
+
+    def setUp(self) -> None:
+        self.valid_payload = {
+            "name": "import_books",
+            "payload": {
+                "books": [
+                    {"name": "Clean Code", "isbn": "0132350882", "author": {"first_name": "Robert", "last_name": "Martin"}},
+                    {"name": "Clean Coder", "isbn": "0137081073", "author": {"first_name": "Robert", "last_name": "Martin"}},
+                    {"name": "", "isbn": "1256841190", "author": {"first_name": "John", "last_name": "Doe"}},
+                ],
+                "batch_size": 2,
+            }
+        }
+
+    def test_queue_and_run_import_job(self):
+        """
+        Test that a queued import is only run by the worker and
+        that its progress and result can be polled afterwards
+
+        :return: A succeeded job with the import result
+        """
+        response = client.post(
+            reverse("create_job"),
+            data=json.dumps(self.valid_payload),
+            content_type="application/json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data["data"]["status"], Job.Status.PENDING)
+        self.assertEqual(response.data["data"]["payload"]["batch_size"], 2)
+        self.assertEqual(Book.objects.count(), 0)
+
+        call_command("run_worker", processes=1, once=True, stdout=StringIO())
+
+        response = client.get(reverse("job", args=[response.data["data"]["id"]]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["data"]["status"], Job.Status.SUCCEEDED)
+        self.assertEqual(response.data["data"]["progress"], 1.0)
+        self.assertEqual(response.data["data"]["result"]["created"], 2)
+        self.assertIn("2", response.data["data"]["result"]["errors"])
+        self.assertEqual(Author.objects.filter(last_name="Martin").count(), 1)
+
+    def test_queue_unknown_job(self):
+        """
+        Test that only registered tasks can be queued
+
+        :return: A response status_code 400
+        """
+        response = client.post(
+            reverse("create_job"),
+            data=json.dumps({"name": "drop_tables"}),
+            content_type="application/json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_queue_job_with_invalid_payload(self):
+        """
+        Test that job payloads are validated for their task, and that the
+        periodic archive_deleted job cannot be queued with custom settings
+
+        :return: A response status_code 400 for every payload
+        """
+        invalid = [
+            {"name": "import_books", "payload": {"books": [], "batch_size": 2}},
+            {"name": "import_books", "payload": {"books": {"name": "Clean Code"}}},
+            {"name": "import_books", "payload": {**self.valid_payload["payload"], "batch_size": 0}},
+            {"name": "import_books", "payload": {**self.valid_payload["payload"], "batch_size": -1}},
+            {"name": "normalize_isbns", "payload": ["batch_size"]},
+            {"name": "archive_deleted", "payload": {"after_days": 0}},
+        ]
+        for data in invalid:
+            with self.subTest(data=data):
+                response = client.post(
+                    reverse("create_job"), data=json.dumps(data), content_type="application/json"
+                )
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.assertFalse(Job.objects.exists())
+
+    def test_get_job_not_found(self):
+        """
+        Test case to get a job that doesn't exist
+
+        :return: A response status_code 404
+        """
+        response = client.get(reverse("job", args=[53]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+@mock.patch.dict(TASKS, {
+    "failing": Task(func=failing_task, concurrency=None),
+    "terminated": Task(func=terminated_task, concurrency=1),
+})
+class JobRunTestCase(APITestCase):
+    """Test case for job retries and concurrency limits"""
+
+    def test_failed_job_is_retried_until_out_of_attempts(self):
+        """
+        Test that a failing job goes back to the queue with a backoff
+        and is marked failed after its last attempt
+
+        :return: A failed job with the error recorded
+        """
+        job = enqueue("failing", max_attempts=2)
+
+        self.assertEqual(run_job(claim_job().id), Job.Status.PENDING)
+        job.refresh_from_db()
+        self.assertGreater(job.run_after, job.created_at)
+        self.assertIsNone(claim_job())
+
+        Job.objects.filter(id=job.id).update(run_after=job.created_at)
+        self.assertEqual(run_job(claim_job().id), Job.Status.FAILED)
+        job.refresh_from_db()
+        self.assertEqual(job.attempts, 2)
+        self.assertIn("RuntimeError: boom", job.error)
+
+    def test_retried_import_resumes_after_committed_batches(self):
+        """
+        Test that an import failing halfway is retried from the
+        first batch that was not committed instead of from the start
+
+        :return: A succeeded job that created every book once
+        """
+        author = {"first_name": "Robert", "last_name": "Martin"}
+        isbns = ["0132350882", "0137081073", "0134494164", "0201633612"]
+        job = enqueue("import_books", {
+            "books": [{"name": f"Book {isbn}", "isbn": isbn, "author": author} for isbn in isbns],
+            "batch_size": 2,
+        })
+        bulk_create = Book.objects.bulk_create
+        calls = []
+
+        def fail_second_batch(books):
+            calls.append(books)
+            if len(calls) == 2:
+                raise RuntimeError("boom")
+            return bulk_create(books)
+
+        with mock.patch.object(Book.objects, "bulk_create", side_effect=fail_second_batch):
+            self.assertEqual(run_job(claim_job().id), Job.Status.PENDING)
+        self.assertEqual(Book.objects.count(), 2)
+
+        Job.objects.filter(id=job.id).update(run_after=job.created_at)
+        self.assertEqual(run_job(claim_job().id), Job.Status.SUCCEEDED)
+
+        job.refresh_from_db()
+        self.assertEqual(job.result, {"created": 4, "errors": {}})
+        self.assertEqual(Book.objects.count(), 4)
+        self.assertEqual(Author.objects.get().book_count, 4)
+
+    def test_stale_jobs_are_requeued_until_out_of_attempts(self):
+        """
+        Test that a job whose worker stopped goes back to the queue,
+        unless it has used up its attempts, so it is marked failed
+
+        :return: One requeued job and one failed job
+        """
+        requeued = enqueue("failing")
+        exhausted = enqueue("failing", max_attempts=1)
+        Job.objects.update(status=Job.Status.RUNNING, attempts=1)
+
+        self.assertEqual(requeue_stale_jobs(stale_after=0), 1)
+
+        requeued.refresh_from_db()
+        exhausted.refresh_from_db()
+        self.assertEqual(requeued.status, Job.Status.PENDING)
+        self.assertEqual(exhausted.status, Job.Status.FAILED)
+        self.assertIn("worker stopped", exhausted.error)
+
+    def test_heartbeat_keeps_running_jobs_from_being_requeued(self):
+        """
+        Test that only the running jobs of workers that stopped sending
+        heartbeats are requeued, however long the job itself takes
+
+        :return: The job of the dead worker requeued
+        """
+        alive = enqueue("failing")
+        dead = enqueue("failing")
+        an_hour_ago = timezone.now() - timedelta(hours=1)
+        Job.objects.filter(id=alive.id).update(status=Job.Status.RUNNING, worker="alive", updated_at=an_hour_ago)
+        Job.objects.filter(id=dead.id).update(status=Job.Status.RUNNING, worker="dead", updated_at=an_hour_ago)
+
+        heartbeat("alive")
+        self.assertEqual(requeue_stale_jobs(stale_after=60), 1)
+
+        dead.refresh_from_db()
+        self.assertEqual(dead.status, Job.Status.PENDING)
+        self.assertEqual(Job.objects.get(id=alive.id).status, Job.Status.RUNNING)
+
+    def test_worker_requeues_abandoned_jobs_while_polling(self):
+        """
+        Test that the worker requeues the job a killed worker left
+        running, so its task is not blocked at its concurrency limit
+
+        :return: Both import jobs succeeded
+        """
+        abandoned = enqueue("import_books")
+        queued = enqueue("import_books")
+        Job.objects.filter(id=abandoned.id).update(
+            status=Job.Status.RUNNING, worker="killed", attempts=1,
+            updated_at=timezone.now() - timedelta(hours=1)
+        )
+
+        call_command("run_worker", processes=1, once=True, stdout=StringIO())
+
+        self.assertEqual(
+            set(Job.objects.filter(id__in=[abandoned.id, queued.id]).values_list("status", flat=True)),
+            {Job.Status.SUCCEEDED}
+        )
+
+    def test_stopped_worker_returns_its_jobs(self):
+        """
+        Test that SIGTERM stops the worker and hands the job it was
+        running back to the queue without using up an attempt
+
+        :return: A pending job owned by no worker
+        """
+        job = enqueue("terminated")
+        stdout = StringIO()
+
+        call_command("run_worker", processes=1, once=True, stdout=stdout)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.PENDING)
+        self.assertEqual(job.attempts, 0)
+        self.assertEqual(job.worker, "")
+        self.assertIn("returned 1 running job(s)", stdout.getvalue())
+        self.assertEqual(claim_job().id, job.id)
+
+    @mock.patch("books.management.commands.run_worker.ProcessPoolExecutor", BrokenPool)
+    def test_worker_survives_a_broken_pool(self):
+        """
+        Test that the worker keeps polling when its pool breaks, retrying
+        the crashed job until it is out of attempts
+
+        :return: A failed job after three crashed attempts
+        """
+        job = enqueue("failing")
+        stderr = StringIO()
+
+        call_command("run_worker", processes=2, once=True, stdout=StringIO(), stderr=stderr)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.FAILED)
+        self.assertEqual(job.attempts, 3)
+        self.assertEqual(stderr.getvalue().count("Restarted the worker pool"), 3)
+
+    def test_claim_respects_concurrency_limit(self):
+        """
+        Test that a task at its concurrency limit is skipped
+        while jobs of other tasks can still be claimed
+
+        :return: The job of the task below its limit
+        """
+        first = enqueue("import_books")
+        second = enqueue("import_books")
+        other = enqueue("failing")
+
+        self.assertEqual(claim_job().id, first.id)
+        self.assertEqual(claim_job().id, other.id)
+        self.assertIsNone(claim_job())
+
+        second.refresh_from_db()
+        self.assertEqual(second.status, Job.Status.PENDING)
+
+    def test_claim_enforces_concurrency_limit_in_the_update(self):
+        """
+        Test that a job is not claimed when another worker took the last
+        slot of its task after the running jobs were counted
+
+        :return: No claimed job
+        """
+        enqueue("import_books")
+        job = enqueue("import_books")
+        Job.objects.exclude(id=job.id).update(status=Job.Status.RUNNING)
+
+        with mock.patch("books.jobs.running_counts", return_value={}):
+            self.assertIsNone(claim_job())
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.PENDING)
@@ -0,0 +1,48 @@
+# Django Imports
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase
+from django.urls import reverse
+
+# Rest Framework Imports
+from rest_framework import status
+from rest_framework.test import APIClient
+
+
+class StatelessRoutesTestCase(TestCase):
+    """Test case to skip the stateful middleware on the api only"""
+
+    def test_api_requests_skip_stateful_middleware(self):
+        """
+        Test that api requests get no session or messages, even when
+        sent with a session cookie
+
+        :return: A response status_code 200
+        """
+        client = APIClient()
+        client.cookies["sessionid"] = "stale-session-key"
+
+        response = client.get(reverse("authors"), {"min_books": 1})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(hasattr(response.wsgi_request, "session"))
+        self.assertFalse(hasattr(response.wsgi_request, "_messages"))
+        self.assertNotIn("Cookie", response.get("Vary", ""))
+
+    def test_admin_keeps_sessions_and_csrf(self):
+        """
+        Test that the admin still logs users in through the session
+        and rejects posts without a csrf token
+
+        :return: A response status_code 200 and a response status_code 403
+        """
+        user = get_user_model().objects.create_superuser("admin", "admin@example.com", "password")
+        self.client.force_login(user)
+
+        response = self.client.get(reverse("admin:index"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.wsgi_request.user, user)
+
+        response = Client(enforce_csrf_checks=True).post(
+            reverse("admin:login"), {"username": "admin", "password": "password"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,86 @@
+# Native Imports
+import json
+
+# Django Imports
+from django.test import override_settings
+from django.urls import reverse
+
+# Rest Framework Imports
+from rest_framework.test import APIClient, APITestCase
+
+# Own Imports
+from books.models import Author, Book
+from core.query_guard import QueryGuardTestMixin
+
+
+class QueryGuardTestCase(QueryGuardTestMixin, APITestCase):
+    """Test case for the query budget and slow query guard"""
+
+    def setUp(self) -> None:
+        self.author = Author.objects.create(first_name="John", last_name="Doe")
+        for index in range(3):
+            Book.objects.create(name=f"Glitch {index}", isbn="9780132350884", author=self.author)
+
+    def test_budget_failure_reports_sql_and_origin(self):
+        """
+        Test that an N+1 loop breaks the budget and the failure names
+        the SQL and the line of project code that ran it
+
+        :return: An AssertionError describing every query
+        """
+        with self.assertRaises(AssertionError) as context:
+            with self.assertQueryBudget(1):
+                [book.author.first_name for book in Book.objects.all()]
+
+        message = str(context.exception)
+        self.assertIn("4 queries run, budget is 1", message)
+        self.assertIn('FROM "authors"', message)
+        self.assertIn("books/tests/test_query_guard.py", message)
+
+    def test_slow_query_failure_reports_plan(self):
+        """
+        Test that a query over the time threshold is reported with its query plan
+
+        :return: An AssertionError with the EXPLAIN QUERY PLAN output
+        """
+        with self.assertRaises(AssertionError) as context:
+            with self.assertQueryBudget(5, slow_ms=-1):
+                list(Book.objects.filter(isbn="9780132350884"))
+
+        message = str(context.exception)
+        self.assertIn("queries slower than -1ms", message)
+        self.assertIn("plan: ", message)
+        self.assertIn("books_isbn_idx", message)
+
+    def test_within_budget_passes(self):
+        """
+        Test that code within its budget and time threshold passes
+
+        :return: The recorded queries
+        """
+        with self.assertQueryBudget(1) as recorder:
+            list(Book.objects.select_related("author"))
+        self.assertEqual(len(recorder.queries), 1)
+
+    @override_settings(QUERY_GUARD_ENABLED=True, QUERY_GUARD_BUDGETS={"PUT book": 1})
+    def test_middleware_logs_endpoint_over_budget(self):
+        """
+        Test that the middleware logs requests over the budget of their endpoint
+
+        :return: A warning naming the endpoint and its queries
+        """
+        client = APIClient()
+        book = Book.objects.first()
+
+        with self.assertLogs("core.query_guard", level="WARNING") as logs:
+            client.put(
+                reverse("book", args=[book.id]),
+                data=json.dumps({
+                    "name": "Glitch", "isbn": "0596007124",
+                    "author": {"first_name": "Victor", "last_name": "Martin"}
+                }),
+                content_type="application/json"
+            )
+
+        self.assertIn("Query guard: PUT book", logs.output[0])
+        self.assertIn("budget is 1", logs.output[0])
@@ -0,0 +1,153 @@
+# Native Imports
+from io import StringIO
+
+# Django Imports
+from django.core.management import call_command
+from django.test import TestCase
+
+# Own Imports
+from books.models import Author, Book
+from books.serializers import BookSerializer
+
+
+class BookSerializerWriteTestCase(TestCase):
+    """Test case for the number of queries issued by book writes"""
+
+    def setUp(self) -> None:
+        self.author = Author.objects.create(first_name="John", last_name="Doe")
+        self.book = Book.objects.create(name="Return of Glitch X", isbn="1256841190", author=self.author)
+
+    def test_create_book_with_existing_author(self):
+        """
+        Test that creating a book for an existing author costs
+        one author lookup, one book insert and one book count update
+
+        :return: The created book attached to the existing author
+        """
+        serializer = BookSerializer(data={
+            "name": "Pythonic Code", "isbn": "0201633612",
+            "author": {"first_name": "John", "last_name": "Doe"}
+        })
+        self.assertTrue(serializer.is_valid())
+
+        with self.assertNumQueries(3):
+            book = serializer.save()
+
+        self.assertEqual(book.author_id, self.author.id)
+        self.assertEqual(Author.objects.count(), 1)
+
+    def test_create_book_with_new_author(self):
+        """
+        Test that creating a book for a new author costs
+        one author lookup, one author insert, one book insert
+        and one book count update
+
+        :return: The created book attached to a newly stored author
+        """
+        serializer = BookSerializer(data={
+            "name": "Clean Code", "isbn": "0875754570",
+            "author": {"first_name": "Robert", "last_name": "Martin"}
+        })
+        self.assertTrue(serializer.is_valid())
+
+        with self.assertNumQueries(4):
+            book = serializer.save()
+
+        book.refresh_from_db()
+        self.assertEqual(book.author.first_name, "Robert")
+        self.assertEqual(book.author.last_name, "Martin")
+
+    def test_update_book_with_unchanged_author(self):
+        """
+        Test that updating a book whose author is unchanged
+        costs a single UPDATE of the book columns
+
+        :return: The updated book with the same author
+        """
+        book = Book.objects.select_related("author").get(id=self.book.id)
+        serializer = BookSerializer(instance=book, data={
+            "name": "Glitch", "isbn": "0596007124",
+            "author": {"first_name": "John", "last_name": "Doe"}
+        })
+        self.assertTrue(serializer.is_valid())
+
+        with self.assertNumQueries(1):
+            serializer.save()
+
+        book.refresh_from_db()
+        self.assertEqual(book.name, "Glitch")
+        self.assertEqual(book.author_id, self.author.id)
+
+    def test_update_book_with_new_author(self):
+        """
+        Test that reassigning a book to a new author costs
+        one author lookup, one author insert, one book update
+        and a single UPDATE moving the book between both counts
+
+        :return: The updated book attached to the new author
+        """
+        book = Book.objects.select_related("author").get(id=self.book.id)
+        serializer = BookSerializer(instance=book, data={
+            "name": "Glitch", "isbn": "0596007124",
+            "author": {"first_name": "Victor", "last_name": "Martin"}
+        })
+        self.assertTrue(serializer.is_valid())
+
+        with self.assertNumQueries(4):
+            serializer.save()
+
+        book.refresh_from_db()
+        self.assertEqual(book.author.first_name, "Victor")
+        self.assertEqual(Author.objects.count(), 2)
+
+
+class AuthorBookCountTestCase(TestCase):
+    """Test case for the denormalized book count of authors"""
+
+    def setUp(self) -> None:
+        self.author = Author.objects.create(first_name="John", last_name="Doe")
+        self.other_author = Author.objects.create(first_name="Robert", last_name="Martin")
+
+    def assert_book_counts(self, author_count:int, other_author_count:int):
+        self.author.refresh_from_db()
+        self.other_author.refresh_from_db()
+        self.assertEqual(self.author.book_count, author_count)
+        self.assertEqual(self.other_author.book_count, other_author_count)
+
+    def test_book_count_follows_create_reassign_and_delete(self):
+        """
+        Test that creating, reassigning and deleting books
+        keeps the book count of both authors in step
+
+        :return: Book counts matching the books table
+        """
+        book = Book.objects.create(name="Glitch", isbn="1256841190", author=self.author)
+        Book.objects.create(name="Clean Code", isbn="0132350882", author=self.author)
+        self.assert_book_counts(2, 0)
+
+        serializer = BookSerializer(instance=book, data={
+            "name": "Glitch", "isbn": "0262033844",
+            "author": {"first_name": "Robert", "last_name": "Martin"}
+        })
+        self.assertTrue(serializer.is_valid())
+        serializer.save()
+        self.assert_book_counts(1, 1)
+
+        Book.objects.filter(id=book.id).delete()
+        self.assert_book_counts(1, 0)
+
+    def test_recount_authors_repairs_drift(self):
+        """
+        Test that recount_authors restores counts changed behind the signals
+
+        :return: Book counts matching the books table
+        """
+        Book.objects.create(name="Glitch", isbn="1256841190", author=self.author)
+        Book.objects.filter(author=self.author).update(author=self.other_author)
+        Author.objects.filter(id=self.author.id).update(book_count=5)
+
+        out = StringIO()
+        call_command("recount_authors", stdout=out)
+
+        self.assertIn("Recounted 2", out.getvalue())
+        self.assert_book_counts(0, 1)
@@ -0,0 +1,134 @@
+# Native Imports
+from datetime import timedelta
+
+# Django Imports
+from django.utils import timezone
+from django.urls import reverse
+
+# Rest Framework Imports
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+# Own Imports
+from books.jobs import archive_deleted, enqueue, schedule_periodic_jobs
+from books.models import ArchivedAuthor, ArchivedBook, Author, Book, Job
+
+
+# Initialize api client
+client = APIClient()
+
+
+class SoftDeleteTestCase(APITestCase):
+    """Test case to soft delete books and authors"""
+
+    def setUp(self) -> None:
+        self.author = Author.objects.create(first_name="Robert", last_name="Martin")
+        self.book = Book.objects.create(name="Clean Code", isbn="9780132350884", author=self.author)
+        self.other_book = Book.objects.create(
+            name="Clean Architecture", isbn="9780134494166", author=self.author
+        )
+
+    def test_delete_book(self):
+        """
+        Test that a deleted book is hidden from every endpoint, kept
+        in the table and taken off the book count of its author
+
+        :return: A response status_code 200, then status_code 404
+        """
+        with self.assertNumQueries(3):
+            response = client.delete(reverse("book", args=[self.book.id]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = client.get(reverse("book", args=[self.book.id]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = client.get(reverse("books"))
+        self.assertEqual([book["id"] for book in response.data["data"]], [self.other_book.id])
+
+        self.assertIsNotNone(Book.all_objects.get(id=self.book.id).deleted_at)
+        self.author.refresh_from_db()
+        self.assertEqual(self.author.book_count, 1)
+
+        response = client.delete(reverse("book", args=[self.book.id]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_delete_author_with_books(self):
+        """
+        Test that deleting an author soft deletes their books and
+        hides the author from the list and autocomplete
+
+        :return: A response status_code 200
+        """
+        response = client.delete(reverse("author", args=[self.author.id]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertFalse(Book.objects.exists())
+        self.assertEqual(Book.all_objects.filter(deleted_at__isnull=False).count(), 2)
+        self.assertEqual(client.get(reverse("authors")).data["data"], [])
+        self.assertEqual(
+            client.get(reverse("authors_autocomplete"), {"q": "rob"}).data["data"], []
+        )
+
+    def test_deleted_rows_are_found_through_partial_index(self):
+        """
+        Test that the archive job finds old soft deleted rows through
+        the partial index on deleted_at instead of a scan
+
+        :return: A query plan using books_deleted_at_idx
+        """
+        plan = Book.all_objects.filter(deleted_at__lt=timezone.now()).explain()
+        self.assertIn("books_deleted_at_idx", plan)
+
+
+class ArchiveDeletedTestCase(APITestCase):
+    """Test case to move old soft deleted rows to the archive tables"""
+
+    def setUp(self) -> None:
+        self.author = Author.objects.create(first_name="Robert", last_name="Martin")
+        self.gone_author = Author.objects.create(first_name="John", last_name="Doe")
+        self.kept = Book.objects.create(name="Clean Code", isbn="9780132350884", author=self.author)
+        self.deleted = Book.objects.create(name="Clean Coder", isbn="9780137081073", author=self.author)
+        self.recent = Book.objects.create(name="Glitch", isbn="9780201633610", author=self.author)
+        Book.objects.create(name="Doe's Book", isbn="9780596007126", author=self.gone_author)
+
+        Book.objects.filter(id__in=[self.deleted.id, self.recent.id]).soft_delete()
+        Author.objects.filter(id=self.gone_author.id).soft_delete()
+
+        # everything but self.recent was deleted long ago
+        old = timezone.now() - timedelta(days=60)
+        Book.all_objects.exclude(id=self.recent.id).filter(deleted_at__isnull=False).update(deleted_at=old)
+        Author.all_objects.filter(id=self.gone_author.id).update(deleted_at=old)
+
+    def test_archive_old_deleted_rows(self):
+        """
+        Test that rows deleted before the cutoff move to the archive in
+        batches, leaving live and recently deleted rows and the counts alone
+
+        :return: A result with the number of archived books and authors
+        """
+        job = enqueue("archive_deleted")
+        result = archive_deleted(job, {"batch_size": 1})
+
+        self.assertEqual(result["books"], 2)
+        self.assertEqual(result["authors"], 1)
+        self.assertEqual(
+            sorted(ArchivedBook.objects.values_list("name", flat=True)),
+            ["Clean Coder", "Doe's Book"]
+        )
+        self.assertEqual(ArchivedAuthor.objects.get().last_name, "Doe")
+
+        self.assertEqual(
+            set(Book.all_objects.values_list("id", flat=True)), {self.kept.id, self.recent.id}
+        )
+        self.assertFalse(Author.all_objects.filter(id=self.gone_author.id).exists())
+        self.author.refresh_from_db()
+        self.assertEqual(self.author.book_count, 1)
+
+    def test_archive_job_is_scheduled_periodically(self):
+        """
+        Test that the worker queues the archive job once per interval
+
+        :return: One queued archive_deleted job
+        """
+        self.assertEqual(schedule_periodic_jobs(), 1)
+        self.assertEqual(schedule_periodic_jobs(), 0)
+        self.assertEqual(Job.objects.filter(name="archive_deleted").count(), 1)
@@ -14,13 +14,14 @@ from rest_framework.test import APIClient, APITestCase
 # Own Imports
 from books.models import Author, Book
 from books.serializers import AuthorSerializer, BookSerializer
+from core.query_guard import QueryGuardTestMixin
 
 
 # Initialize api client
 client = APIClient()
 
 
-class BooksTestCase(APITestCase):
+class BooksTestCase(QueryGuardTestMixin, APITestCase):
     """Test case to get all the books api"""
     
     def setUp(self) -> None:
@@ -44,9 +45,21 @@ class BooksTestCase(APITestCase):
         
         self.assertEqual(response.data, serializer_data)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+    
+    def test_get_all_books_query_budget(self):
+        """
+        Test that the books are fetched with their authors 
+        in a single query, however many books there are
+        
+        :return: A response status_code 200 within one query
+        """
+        with self.assertQueryBudget(1):
+            response = client.get(reverse("books"))
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
         
         
-class BookTestCase(APITestCase):
+class BookTestCase(QueryGuardTestMixin, APITestCase):
     """Test case to create and get a single book api"""
     
     def setUp(self) -> None:
@@ -54,7 +67,7 @@ class BookTestCase(APITestCase):
         self.book = Book.objects.create(name="Return of Glitch X", isbn="1256841190", author=self.author)
         self.valid_payload = {
             "name": "Pythonic Code",
-            "isbn": "2738294838",
+            "isbn": "0201633612",
             "author": {
                 "first_name": self.author.first_name,
                 "last_name": self.author.last_name
@@ -85,6 +98,17 @@ class BookTestCase(APITestCase):
         self.assertEqual(response.data, serializer_data)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
     
+    def test_get_single_book_query_budget(self):
+        """
+        Test that a book is fetched with its author in a single query
+        
+        :return: A response status_code 200 within one query
+        """
+        with self.assertQueryBudget(1):
+            response = client.get(reverse('book', args=[self.book.id]))
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+    
     def test_create_valid_book(self):
         """
         Test case to send a POST request to the create_book 
@@ -122,7 +146,7 @@ class UpdateSingleBookTestCase(APITestCase):
         self.book = Book.objects.create(name="Return of Glitch X", isbn="1256841190", author=self.author)
         self.valid_payload = {
             "name": "Glitch",
-            "isbn": "2738534838",
+            "isbn": "0596007124",
             "author": {
                 "first_name": "Victor",
                 "last_name": "Martin"
@@ -130,7 +154,7 @@ class UpdateSingleBookTestCase(APITestCase):
         }
         self.invalid_payload = {
             "name": "",
-            "isbn": "2738534838",
+            "isbn": "0596007124",
             "author": {
                 "first_name": "Victor",
                 "last_name": 456
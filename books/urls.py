@@ -3,9 +3,11 @@ from django.urls import path
 
 # API View Imports
 from books.views import (
-    BooksAPIView, GetUpdateBookAPIView,
-    AuthorsAPIView, GetUpdateAuthorAPIView,
-    CreateAuthorAPIView, CreateBookAPIView
+    BooksAPIView, GetUpdateBookAPIView, GetBookByISBNAPIView,
+    AuthorsAPIView, AuthorAutocompleteAPIView, GetUpdateAuthorAPIView,
+    CreateAuthorAPIView, CreateBookAPIView,
+    CreateJobAPIView, GetJobAPIView,
+    ExportAPIView, StatsAPIView
 )
 
 
@@ -13,12 +15,24 @@ urlpatterns = [
     # fetch endpoints
     path("books/", BooksAPIView.as_view(), name="books"),
     path("authors/", AuthorsAPIView.as_view(), name="authors"),
+    path("authors/autocomplete/", AuthorAutocompleteAPIView.as_view(), name="authors_autocomplete"),
     
     # get detail and update endpoints
     path("book/<int:id>/", GetUpdateBookAPIView.as_view(), name="book"),
+    path("book/isbn/<str:isbn>/", GetBookByISBNAPIView.as_view(), name="book_by_isbn"),
     path("author/<int:id>/", GetUpdateAuthorAPIView.as_view(), name="author"),
     
     # create new resource endpoints
     path("author/", CreateAuthorAPIView.as_view(), name="create_author"),
     path("book/", CreateBookAPIView.as_view(), name="create_book"),
+    
+    # background job endpoints
+    path("job/", CreateJobAPIView.as_view(), name="create_job"),
+    path("job/<int:id>/", GetJobAPIView.as_view(), name="job"),
+    
+    # export endpoints
+    path("export/<str:table>/", ExportAPIView.as_view(), name="export"),
+    
+    # monitoring endpoints
+    path("stats/", StatsAPIView.as_view(), name="stats"),
 ]
@@ -1,11 +1,25 @@
+# Django Imports
+from django.http import StreamingHttpResponse
+
 # Rest Framework Imports
 from rest_framework.response import Response
 from rest_framework.request import Request
-from rest_framework import views, status, permissions
+from rest_framework import views, status, permissions, serializers
 
 # Own Imports
-from books.models import Author, Book
-from books.serializers import AuthorSerializer, BookSerializer
+from books.autocomplete import autocomplete
+from books.cache import cache_response
+from books.models import Author, Book, Job
+from books.serializers import (
+    AuthorSerializer, BookSerializer, BookPatchSerializer, 
+    ExportSerializer, JobSerializer
+)
+from books.exports import EXPORT_TABLES, FILE_TYPES, export
+from books.filters import (
+    AuthorAutocompleteSerializer, AuthorFilterSerializer, BookFilterSerializer
+)
+from books.isbn import InvalidISBN, canonical_isbn
+from books.stats import catalogue_stats
 
 # Third party Imports
 from rest_api_payload import success_response, error_response
@@ -17,17 +31,27 @@ from drf_yasg.utils import swagger_auto_schema
 
 class BooksAPIView(views.APIView):
     serializer_class = BookSerializer
+    filter_class = BookFilterSerializer
     permission_classes = (permissions.AllowAny, )
     
+    @swagger_auto_schema(query_serializer=filter_class)
+    @cache_response("books.book", "books.author")
     def get(self, request:Request) -> Response:
         """
-        This view fetches all the books in the db
+        This view fetches all the books in the db, optionally filtered 
+        by author_id, isbn or name prefix and ordered by name or id
         
         :param request: This is the request object that is sent to the view
         :type request: Request
         :return: A Response object.
         """
-        books = Book.objects.all()
+        filters = self.filter_class(data=request.query_params)
+        
+        if not filters.is_valid():
+            payload = error_response(status=False, message=filters.errors)
+            return Response(data=payload, status=status.HTTP_400_BAD_REQUEST)
+        
+        books = filters.filter_queryset(Book.objects.select_related("author"))
         serializer = self.serializer_class(books, many=True)
         
         payload = success_response(
@@ -35,6 +59,37 @@ class BooksAPIView(views.APIView):
             data=serializer.data
         )
         return Response(data=payload, status=status.HTTP_200_OK)
+    
+    @swagger_auto_schema(request_body=BookPatchSerializer(many=True))
+    def patch(self, request:Request) -> Response:
+        """
+        This view applies a list of partial updates, each an id and the 
+        fields to change, to many books at once. Nothing is written 
+        unless every update is valid
+        
+        :param request: This is the request object that is sent to the view
+        :type request: Request
+        :return: A Response object.
+        """
+        serializer = BookPatchSerializer(data=request.data, many=True, allow_empty=False)
+        
+        if serializer.is_valid():
+            try:
+                books = serializer.save()
+            except serializers.ValidationError as error:
+                # a book or author was deleted since the updates were validated
+                payload = error_response(status=False, message=error.detail)
+                return Response(data=payload, status=status.HTTP_400_BAD_REQUEST)
+            
+            payload = success_response(
+                status=True, message="Books updated!",
+                data={"updated": len(books)}
+            )
+            return Response(data=payload, status=status.HTTP_200_OK)
+        
+        else:
+            payload = error_response(status=False, message=serializer.errors)
+            return Response(data=payload, status=status.HTTP_400_BAD_REQUEST)
 
 
 class GetUpdateBookAPIView(views.APIView):
@@ -53,7 +108,7 @@ class GetUpdateBookAPIView(views.APIView):
         """
         
         try:
-            book = Book.objects.get(id=id)
+            book = Book.objects.select_related("author").get(id=id)
         except (Book.DoesNotExist, Exception):
             payload = error_response(
                 status=False, message="Book does not exist!"
@@ -80,7 +135,7 @@ class GetUpdateBookAPIView(views.APIView):
         """
         
         try:
-            book = Book.objects.get(id=id)
+            book = Book.objects.select_related("author").get(id=id)
         except (Book.DoesNotExist, Exception):
             payload = error_response(
                 status=False, message="Book does not exist!"
@@ -101,21 +156,93 @@ class GetUpdateBookAPIView(views.APIView):
         else:
             payload = error_response(status=False, message=serializer.errors)
             return Response(data=payload, status=status.HTTP_400_BAD_REQUEST)
+    
+    def delete(self, request:Request, id:int) -> Response:
+        """
+        This view soft deletes a book with a given id, hiding it from every
+        endpoint until the archive job moves it to the books archive
+        
+        :param request: This is the request object that is sent to the view
+        :type request: Request
+        :param id: The id of the book to be deleted
+        :type id: int
+        :return: A Response object.
+        """
+        
+        if not Book.objects.filter(id=id).soft_delete():
+            payload = error_response(
+                status=False, message="Book does not exist!"
+            )
+            return Response(data=payload, status=status.HTTP_404_NOT_FOUND)
+        
+        payload = success_response(
+            status=True, message="Book deleted!",
+            data={"id": id}
+        )
+        return Response(data=payload, status=status.HTTP_200_OK)
+        
+
+class GetBookByISBNAPIView(views.APIView):
+    serializer_class = BookSerializer
+    permission_classes = (permissions.AllowAny, )
+    
+    def get(self, request:Request, isbn:str) -> Response:
+        """
+        This view fetches a book by its ISBN, given as ISBN-10 or ISBN-13 
+        with or without hyphens, through the index on the canonical ISBN-13
+        
+        :param request: This is the request object that is sent to the view
+        :type request: Request
+        :param isbn: The ISBN of the book to be fetched
+        :type isbn: str
+        :return: A Response object.
+        """
+        
+        try:
+            isbn = canonical_isbn(isbn)
+        except InvalidISBN as error:
+            payload = error_response(status=False, message=str(error))
+            return Response(data=payload, status=status.HTTP_400_BAD_REQUEST)
+        
+        book = Book.objects.select_related("author").filter(isbn=isbn).order_by("id").first()
+        
+        if book is None:
+            payload = error_response(
+                status=False, message="Book does not exist!"
+            )
+            return Response(data=payload, status=status.HTTP_404_NOT_FOUND)
+        
+        serializer = self.serializer_class(book)
+        payload = success_response(
+            status=True, message="Book retrieved!",
+            data=serializer.data
+        )
+        return Response(data=payload, status=status.HTTP_200_OK)
         
 
 class AuthorsAPIView(views.APIView):
     serializer_class = AuthorSerializer
+    filter_class = AuthorFilterSerializer
     permission_classes = (permissions.AllowAny, )
     
+    @swagger_auto_schema(query_serializer=filter_class)
+    @cache_response("books.author")
     def get(self, request:Request) -> Response:
         """
-        This view fetches all the authors in the db
+        This view fetches all the authors in the db, optionally filtered 
+        by last_name prefix and ordered by last_name or id
         
         :param request: This is the request object that is sent to the view
         :type request: Request
         :return: A Response object.
         """
-        authors = Author.objects.all()
+        filters = self.filter_class(data=request.query_params)
+        
+        if not filters.is_valid():
+            payload = error_response(status=False, message=filters.errors)
+            return Response(data=payload, status=status.HTTP_400_BAD_REQUEST)
+        
+        authors = filters.filter_queryset(Author.objects.all())
         serializer = self.serializer_class(authors, many=True)
         
         payload = success_response(
@@ -125,6 +252,35 @@ class AuthorsAPIView(views.APIView):
         return Response(data=payload, status=status.HTTP_200_OK)
     
 
+class AuthorAutocompleteAPIView(views.APIView):
+    filter_class = AuthorAutocompleteSerializer
+    permission_classes = (permissions.AllowAny, )
+    
+    @swagger_auto_schema(query_serializer=filter_class)
+    def get(self, request:Request) -> Response:
+        """
+        This view returns the first authors, in name order, whose first, 
+        last or full name starts with the query, for type-ahead inputs
+        
+        :param request: This is the request object that is sent to the view
+        :type request: Request
+        :return: A Response object.
+        """
+        params = self.filter_class(data=request.query_params)
+        
+        if not params.is_valid():
+            payload = error_response(status=False, message=params.errors)
+            return Response(data=payload, status=status.HTTP_400_BAD_REQUEST)
+        
+        authors = autocomplete(params.validated_data["q"], params.validated_data["limit"])
+        
+        payload = success_response(
+            status=True, message="Authors retrieved!",
+            data=authors
+        )
+        return Response(data=payload, status=status.HTTP_200_OK)
+    
+
 class GetUpdateAuthorAPIView(views.APIView):
     serializer_class = AuthorSerializer
     permission_classes = (permissions.AllowAny, )
@@ -189,6 +345,30 @@ class GetUpdateAuthorAPIView(views.APIView):
         else:
             payload = error_response(status=False, message=serializer.errors)
             return Response(data=payload, status=status.HTTP_400_BAD_REQUEST)
+    
+    def delete(self, request:Request, id:int) -> Response:
+        """
+        This view soft deletes an author with a given id together with 
+        their books, until the archive job moves them to the archives
+        
+        :param request: This is the request object that is sent to the view
+        :type request: Request
+        :param id: The id of the author to be deleted
+        :type id: int
+        :return: A Response object.
+        """
+        
+        if not Author.objects.filter(id=id).soft_delete():
+            payload = error_response(
+                status=False, message="Author does not exist!"
+            )
+            return Response(data=payload, status=status.HTTP_404_NOT_FOUND)
+        
+        payload = success_response(
+            status=True, message="Author deleted!",
+            data={"id": id}
+        )
+        return Response(data=payload, status=status.HTTP_200_OK)
         
     
     
@@ -247,4 +427,125 @@ class CreateBookAPIView(views.APIView):
         
         else:
             payload = error_response(status=False, message=serializer.errors)
-            return Response(data=payload, status=status.HTTP_400_BAD_REQUEST)
\ No newline at end of file
+            return Response(data=payload, status=status.HTTP_400_BAD_REQUEST)
+
+
+class CreateJobAPIView(views.APIView):
+    serializer_class = JobSerializer
+    permission_classes = (permissions.AllowAny, )
+    
+    @swagger_auto_schema(request_body=serializer_class)
+    def post(self, request:Request) -> Response:
+        """
+        This view queues a background job, e.g. a large import, to be run 
+        by `manage.py run_worker` outside of the request
+        
+        :param request: This is the request object that is sent to the view
+        :type request: Request
+        :return: A Response object.
+        """
+        serializer = self.serializer_class(data=request.data)
+        
+        if serializer.is_valid():
+            serializer.save()
+            
+            payload = success_response(
+                status=True, message="Job queued successfully!",
+                data=serializer.data
+            )
+            return Response(data=payload, status=status.HTTP_202_ACCEPTED)
+        
+        else:
+            payload = error_response(status=False, message=serializer.errors)
+            return Response(data=payload, status=status.HTTP_400_BAD_REQUEST)
+
+
+class GetJobAPIView(views.APIView):
+    serializer_class = JobSerializer
+    permission_classes = (permissions.AllowAny, )
+    
+    def get(self, request:Request, id:int) -> Response:
+        """
+        This view fetches the status, progress and result of a job
+        
+        :param request: This is the request object that is sent to the view
+        :type request: Request
+        :param id: The id of the job to be fetched
+        :type id: int
+        :return: A Response object.
+        """
+        
+        try:
+            job = Job.objects.get(id=id)
+        except (Job.DoesNotExist, Exception):
+            payload = error_response(
+                status=False, message="Job does not exist!"
+            )
+            return Response(data=payload, status=status.HTTP_404_NOT_FOUND)
+        
+        serializer = self.serializer_class(job)
+        payload = success_response(
+            status=True, message="Job retrieved!",
+            data=serializer.data
+        )
+        return Response(data=payload, status=status.HTTP_200_OK)
+
+
+
+class ExportAPIView(views.APIView):
+    serializer_class = ExportSerializer
+    permission_classes = (permissions.AllowAny, )
+    
+    @swagger_auto_schema(query_serializer=serializer_class)
+    def get(self, request:Request, table:str) -> StreamingHttpResponse:
+        """
+        This view streams a columnar export of the books or authors table,
+        as csv, or as Arrow IPC stream or Parquet when pyarrow is installed
+        
+        :param request: This is the request object that is sent to the view
+        :type request: Request
+        :param table: The table to be exported, books or authors
+        :type table: str
+        :return: A StreamingHttpResponse object.
+        """
+        
+        if table not in EXPORT_TABLES:
+            payload = error_response(
+                status=False, message="Export does not exist!"
+            )
+            return Response(data=payload, status=status.HTTP_404_NOT_FOUND)
+        
+        serializer = self.serializer_class(data=request.query_params)
+        
+        if not serializer.is_valid():
+            payload = error_response(status=False, message=serializer.errors)
+            return Response(data=payload, status=status.HTTP_400_BAD_REQUEST)
+        
+        file_type = serializer.validated_data["file_type"]
+        extension, content_type, _ = FILE_TYPES[file_type]
+        
+        response = StreamingHttpResponse(
+            export(table, file_type, serializer.validated_data["batch_size"]),
+            content_type=content_type
+        )
+        response["Content-Disposition"] = f'attachment; filename="{table}.{extension}"'
+        return response
+
+
+class StatsAPIView(views.APIView):
+    permission_classes = (permissions.AllowAny, )
+    
+    def get(self, request:Request) -> Response:
+        """
+        This view returns the row count and recent write rate of the books
+        and authors tables, cheap enough to be polled by monitoring
+        
+        :param request: This is the request object that is sent to the view
+        :type request: Request
+        :return: A Response object.
+        """
+        payload = success_response(
+            status=True, message="Stats retrieved!",
+            data=catalogue_stats()
+        )
+        return Response(data=payload, status=status.HTTP_200_OK)
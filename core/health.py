@@ -0,0 +1,72 @@
+"""
+Liveness and readiness probes.
+
+``HealthCheckMiddleware`` sits first in ``MIDDLEWARE`` and answers the probes
+of the load balancer itself, so they skip the session, CSRF, auth and
+messages middleware, URL resolution and the query guard:
+
+    /healthz   200 while the process serves requests, never touches the database
+    /readyz    200 once the database answers ``SELECT 1`` within
+               ``READINESS_TIMEOUT`` seconds, 503 otherwise
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+from django.conf import settings
+from django.db import connection
+from django.http import JsonResponse
+
+logger = logging.getLogger(__name__)
+
+
+def ping_database() -> None:
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+    except Exception:
+        # reconnect on the next ping instead of reusing a broken connection
+        connection.close()
+        raise
+
+
+class HealthCheckMiddleware:
+
+    def __init__(self, get_response) -> None:
+        self.get_response = get_response
+        self.probes = {"/healthz": self.healthz, "/readyz": self.readyz}
+        self.pinger = None
+        self.ping = None
+
+    def __call__(self, request):
+        probe = self.probes.get(request.path_info)
+        if probe is None or request.method not in ("GET", "HEAD"):
+            return self.get_response(request)
+        return probe()
+
+    def healthz(self) -> JsonResponse:
+        return JsonResponse({"status": "ok"})
+
+    def readyz(self) -> JsonResponse:
+        """
+        This method pings the database from a single long-lived thread which
+        keeps its connection open between probes. While a ping hangs, probes
+        wait on that ping instead of queueing more behind it
+        """
+        if self.pinger is None:
+            # started on the first probe so it runs in the worker, not a preloading master
+            self.pinger = ThreadPoolExecutor(max_workers=1, thread_name_prefix="readyz")
+
+        if self.ping is None or self.ping.done():
+            self.ping = self.pinger.submit(ping_database)
+
+        try:
+            self.ping.result(timeout=settings.READINESS_TIMEOUT)
+        except TimeoutError:
+            logger.warning("Readiness probe: database did not answer within %ss", settings.READINESS_TIMEOUT)
+            return JsonResponse({"status": "unavailable", "database": "timeout"}, status=503)
+        except Exception:
+            logger.exception("Readiness probe: database error")
+            return JsonResponse({"status": "unavailable", "database": "error"}, status=503)
+
+        return JsonResponse({"status": "ok", "database": "ok"})
@@ -0,0 +1,49 @@
+"""
+Route-aware variants of the stateful middleware.
+
+The API under ``STATELESS_PATH_PREFIXES`` authenticates nobody and keeps no
+session, so these subclasses hand its requests straight to the next
+middleware. Every other route, the admin included, runs the stock Django
+middleware unchanged. Subclassing keeps the admin system checks, which look
+for these classes in ``MIDDLEWARE``, passing.
+"""
+from django.conf import settings
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.messages.middleware import MessageMiddleware
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.middleware.csrf import CsrfViewMiddleware
+
+
+def is_stateless(request) -> bool:
+    return request.path_info.startswith(settings.STATELESS_PATH_PREFIXES)
+
+
+class StatelessRoutesMixin:
+    """Skips the middleware for requests to the stateless routes"""
+
+    def __call__(self, request):
+        if is_stateless(request):
+            # returns a coroutine when the next middleware is async, like super()
+            return self.get_response(request)
+        return super().__call__(request)
+
+
+class RouteSessionMiddleware(StatelessRoutesMixin, SessionMiddleware):
+    pass
+
+
+class RouteCsrfViewMiddleware(StatelessRoutesMixin, CsrfViewMiddleware):
+
+    def process_view(self, request, callback, callback_args, callback_kwargs):
+        # called by the handler directly, not through __call__
+        if is_stateless(request):
+            return None
+        return super().process_view(request, callback, callback_args, callback_kwargs)
+
+
+class RouteAuthenticationMiddleware(StatelessRoutesMixin, AuthenticationMiddleware):
+    pass
+
+
+class RouteMessageMiddleware(StatelessRoutesMixin, MessageMiddleware):
+    pass
@@ -0,0 +1,178 @@
+"""
+Query budget and slow query guard.
+
+Records every query a request or a block of test code runs, with its duration
+and the line of project code that issued it. ``QueryGuardMiddleware`` logs
+requests that exceed the query budget of their endpoint or run a slow query,
+and ``QueryGuardTestMixin`` fails tests for the same reasons.
+"""
+import logging
+import time
+import traceback
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+from typing import List, Optional
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+EXPLAINABLE = ("SELECT", "WITH", "UPDATE", "DELETE")
+
+
+class RecordedQuery:
+    def __init__(self, alias:str, sql:str, params, duration:float, origin:str) -> None:
+        self.alias = alias
+        self.sql = sql
+        self.params = params
+        self.duration = duration
+        self.origin = origin
+
+    @property
+    def duration_ms(self) -> float:
+        return self.duration * 1000
+
+    def explain(self) -> str:
+        """
+        This method returns the query plan of the query, ``EXPLAIN QUERY PLAN``
+        on SQLite and ``EXPLAIN`` elsewhere; statements that cannot be
+        explained, such as savepoints, return an empty string
+        """
+        if not self.sql.lstrip().upper().startswith(EXPLAINABLE):
+            return ""
+
+        connection = connections[self.alias]
+        prefix = "EXPLAIN QUERY PLAN " if connection.vendor == "sqlite" else "EXPLAIN "
+
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(prefix + self.sql, self.params)
+                return "\n".join(" ".join(map(str, row)) for row in cursor.fetchall())
+        except Exception as error:
+            return f"EXPLAIN failed: {error}"
+
+    def describe(self, with_plan:bool = False) -> str:
+        lines = [f"[{self.duration_ms:.1f}ms] {self.sql}", f"    from {self.origin}"]
+        if with_plan:
+            plan = self.explain()
+            if plan:
+                lines.extend(f"    plan: {line}" for line in plan.splitlines())
+        return "\n".join(lines)
+
+
+def query_origin() -> str:
+    """
+    This function returns the innermost frame of project code on the
+    current stack, skipping this module, Django and installed packages
+    """
+    base_dir = str(settings.BASE_DIR)
+
+    for frame in reversed(traceback.extract_stack()):
+        filename = frame.filename
+        if (
+            filename.startswith(base_dir)
+            and filename != __file__
+            and "site-packages" not in filename
+        ):
+            return f"{Path(filename).relative_to(base_dir)}:{frame.lineno} in {frame.name}"
+    return "unknown"
+
+
+class QueryRecorder:
+    """Database execute wrapper that records the queries run while installed"""
+
+    def __init__(self) -> None:
+        self.queries: List[RecordedQuery] = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append(RecordedQuery(
+                alias=context["connection"].alias, sql=sql, params=params,
+                duration=time.perf_counter() - start, origin=query_origin()
+            ))
+
+    @contextmanager
+    def record(self):
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(self))
+            yield self
+
+    def violations(self, budget:Optional[int], slow_ms:Optional[float]) -> Optional[str]:
+        """
+        This method describes the queries breaking the budget or the slow
+        query threshold, with the plan of every slow query
+
+        :param budget: The maximum number of queries, None for no budget
+        :type budget: int
+        :param slow_ms: The slowest allowed query in milliseconds, None for no limit
+        :type slow_ms: float
+        :return: A report of the violations, or None when there are none.
+        """
+        report = []
+
+        # plans are collected first, EXPLAIN itself must not be recorded
+        slow = [
+            query.describe(with_plan=True) for query in self.queries
+            if slow_ms is not None and query.duration_ms > slow_ms
+        ]
+
+        if budget is not None and len(self.queries) > budget:
+            report.append(f"{len(self.queries)} queries run, budget is {budget}:")
+            report.extend(query.describe() for query in self.queries)
+
+        if slow:
+            report.append(f"{len(slow)} queries slower than {slow_ms}ms:")
+            report.extend(slow)
+
+        return "\n".join(report) if report else None
+
+
+class QueryGuardMiddleware:
+    """
+    Logs requests that run more queries than the budget of their endpoint,
+    ``"<METHOD> <url name>"`` in ``QUERY_GUARD_BUDGETS`` or
+    ``QUERY_GUARD_DEFAULT_BUDGET`` otherwise, or
+    a query slower than ``QUERY_GUARD_SLOW_MS``. Only installed when
+    ``QUERY_GUARD_ENABLED`` is set, which defaults to ``DEBUG``
+    """
+
+    def __init__(self, get_response) -> None:
+        if not settings.QUERY_GUARD_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+
+        with recorder.record():
+            response = self.get_response(request)
+
+        match = request.resolver_match
+        endpoint = f"{request.method} {match.url_name if match else None}"
+        budget = settings.QUERY_GUARD_BUDGETS.get(endpoint, settings.QUERY_GUARD_DEFAULT_BUDGET)
+
+        report = recorder.violations(budget, settings.QUERY_GUARD_SLOW_MS)
+        if report:
+            logger.warning("Query guard: %s %s\n%s", endpoint, request.path, report)
+        return response
+
+
+class QueryGuardTestMixin:
+    """TestCase mixin failing tests that break a query budget or run slow queries"""
+
+    @contextmanager
+    def assertQueryBudget(self, budget:int, slow_ms:Optional[float] = None):
+        recorder = QueryRecorder()
+
+        with recorder.record():
+            yield recorder
+
+        report = recorder.violations(budget, slow_ms)
+        if report:
+            self.fail(report)
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.1/ref/settings/
 """
 import os
+import tempfile
 from pathlib import Path
 from decouple import config
 
@@ -56,23 +57,35 @@ THIRD_PARTY_APPS = [
 INSTALLED_APPS = LOCAL_APPS + OWN_APPS + THIRD_PARTY_APPS
 
 MIDDLEWARE = [
+    # answers /healthz and /readyz before any other middleware runs
+    "core.health.HealthCheckMiddleware",
+    
     "django.middleware.security.SecurityMiddleware",
     
     # whitenoise middleware
     "whitenoise.middleware.WhiteNoiseMiddleware",
     
-    "django.contrib.sessions.middleware.SessionMiddleware",
+    # session, csrf, auth and messages middleware skipping the stateless
+    # routes in STATELESS_PATH_PREFIXES, see core/middleware.py
+    "core.middleware.RouteSessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     
     # cors headers middleware
     "corsheaders.middleware.CorsMiddleware",
     
-    "django.middleware.csrf.CsrfViewMiddleware",
-    "django.contrib.auth.middleware.AuthenticationMiddleware",
-    "django.contrib.messages.middleware.MessageMiddleware",
+    "core.middleware.RouteCsrfViewMiddleware",
+    "core.middleware.RouteAuthenticationMiddleware",
+    "core.middleware.RouteMessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    
+    # query budget and slow query guard, only active when enabled below
+    "core.query_guard.QueryGuardMiddleware",
 ]
 
+# Routes served without sessions, csrf checks, request.user or messages; the
+# API authenticates nobody (DEFAULT_AUTHENTICATION_CLASSES is empty)
+STATELESS_PATH_PREFIXES = ("/api/v1/",)
+
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",
     "https://lib-books.netlify.app",
@@ -91,6 +104,59 @@ REST_FRAMEWORK = {
     ),
 }
 
+# Background jobs
+# Number of worker processes started by `manage.py run_worker`, seconds between
+# queue polls, base seconds of the exponential retry backoff, seconds between
+# the heartbeats a worker sends for its running jobs, and seconds without a
+# heartbeat after which a running job is considered abandoned by its worker
+
+JOB_WORKER_PROCESSES = config("JOB_WORKER_PROCESSES", default=2, cast=int)
+
+JOB_POLL_INTERVAL = config("JOB_POLL_INTERVAL", default=1.0, cast=float)
+
+JOB_RETRY_BACKOFF = config("JOB_RETRY_BACKOFF", default=5, cast=int)
+
+JOB_HEARTBEAT_INTERVAL = config("JOB_HEARTBEAT_INTERVAL", default=30, cast=int)
+
+JOB_STALE_AFTER = config("JOB_STALE_AFTER", default=300, cast=int)
+
+# Soft deleted books and authors are moved to the archive tables this many
+# days after their deletion, by an archive_deleted job the worker queues
+# every ARCHIVE_INTERVAL seconds
+
+ARCHIVE_AFTER_DAYS = config("ARCHIVE_AFTER_DAYS", default=30, cast=int)
+
+ARCHIVE_INTERVAL = config("ARCHIVE_INTERVAL", default=86400, cast=int)
+
+# Query guard
+# Logs requests running more queries than the budget of their endpoint, keyed
+# by "<METHOD> <url name>", or any query slower than QUERY_GUARD_SLOW_MS, with
+# the SQL, the line of code that ran it and its query plan. Enabled by default
+# when DEBUG is on.
+
+QUERY_GUARD_ENABLED = config("QUERY_GUARD_ENABLED", default=DEBUG, cast=bool)
+
+QUERY_GUARD_SLOW_MS = config("QUERY_GUARD_SLOW_MS", default=100, cast=float)
+
+QUERY_GUARD_DEFAULT_BUDGET = config("QUERY_GUARD_DEFAULT_BUDGET", default=10, cast=int)
+
+QUERY_GUARD_BUDGETS = {
+    "GET books": 1,
+    "PATCH books": 6,
+    "GET authors": 1,
+    "GET authors_autocomplete": 1,
+    "GET stats": 4,
+    "GET book": 1,
+    "PUT book": 5,
+    "DELETE book": 4,
+    "GET book_by_isbn": 1,
+    "GET author": 1,
+    "PUT author": 2,
+    "DELETE author": 6,
+    "POST create_book": 4,
+    "POST create_author": 1,
+}
+
 ROOT_URLCONF = "core.urls"
 
 TEMPLATES = [
@@ -116,10 +182,63 @@ WSGI_APPLICATION = "core.wsgi.application"
 # https://docs.djangoproject.com/en/4.1/ref/settings/#databases
 
 DATABASES = {
-    "default": {"ENGINE": "django.db.backends.sqlite3", "NAME": BASE_DIR / "db.sqlite3"}
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3", 
+        "NAME": config("DATABASE_PATH", default=str(BASE_DIR / "db.sqlite3")),
+    }
 }
 
 
+# Cache
+# File based by default so every gunicorn worker on a host shares the cached
+# responses and data versions; point CACHE_BACKEND and CACHE_LOCATION at Redis
+# or Memcached when running on several hosts.
+
+CACHES = {
+    "default": {
+        "BACKEND": config(
+            "CACHE_BACKEND", default="django.core.cache.backends.filebased.FileBasedCache"
+        ),
+        "LOCATION": config(
+            "CACHE_LOCATION", default=os.path.join(tempfile.gettempdir(), "book-library-cache")
+        ),
+    }
+}
+
+# The tests run against an in-process cache emptied after every test
+# instead of the cache above
+
+TEST_RUNNER = "core.test_runner.TestRunner"
+
+# Seconds a cached list response is kept, entries are invalidated on writes
+# through the data version of their models long before, and seconds a request
+# waits for another to build the response it missed before building it itself
+
+RESPONSE_CACHE_TIMEOUT = config("RESPONSE_CACHE_TIMEOUT", default=300, cast=int)
+
+RESPONSE_CACHE_LOCK_TIMEOUT = config("RESPONSE_CACHE_LOCK_TIMEOUT", default=10, cast=int)
+
+# Stats
+# Seconds the table counts of /api/v1/stats/ are cached, and minutes the
+# recent write rate is averaged over
+
+STATS_CACHE_TIMEOUT = config("STATS_CACHE_TIMEOUT", default=30, cast=int)
+
+STATS_WRITE_WINDOW = config("STATS_WRITE_WINDOW", default=5, cast=int)
+
+# Health checks
+# Seconds /readyz waits for the database to answer before reporting the app
+# as not ready
+
+READINESS_TIMEOUT = config("READINESS_TIMEOUT", default=2.0, cast=float)
+
+# Author autocomplete
+# Largest author table the in-process prefix index is built for, larger
+# tables are searched with indexed prefix queries instead
+
+AUTOCOMPLETE_INDEX_MAX_AUTHORS = config("AUTOCOMPLETE_INDEX_MAX_AUTHORS", default=200000, cast=int)
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
 
@@ -0,0 +1,45 @@
+"""
+Test runner that keeps the tests off the shared response cache.
+
+The default file cache lives in the temp directory shared with the
+development server, so versions and responses built from the test database
+would outlive the run. The tests get an in-process cache instead, emptied
+after every test, since rolled back test data never bumps the data versions
+of the responses cached from it.
+"""
+from django.core.cache import caches
+from django.test import override_settings
+from django.test.runner import DiscoverRunner
+from django.test.utils import iter_test_cases
+
+
+TEST_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "book-library-tests",
+    }
+}
+
+
+def clear_caches() -> None:
+    for cache in caches.all():
+        cache.clear()
+
+
+class TestRunner(DiscoverRunner):
+    """Runs the tests against a cache of their own"""
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.test_caches = override_settings(CACHES=TEST_CACHES)
+        self.test_caches.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self.test_caches.disable()
+        super().teardown_test_environment(**kwargs)
+
+    def build_suite(self, *args, **kwargs):
+        suite = super().build_suite(*args, **kwargs)
+        for test in iter_test_cases(suite):
+            test.addCleanup(clear_caches)
+        return suite
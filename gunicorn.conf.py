@@ -0,0 +1,83 @@
+"""
+Gunicorn config for core project.
+
+Gunicorn loads this file from the working directory. Workers and threads are
+sized from the CPUs available to the process and can be overridden from the
+environment:
+
+    GUNICORN_WORKER_CLASS   sync, gthread (default) or uvicorn
+    WEB_CONCURRENCY         number of worker processes
+    GUNICORN_THREADS        threads per gthread worker
+    GUNICORN_MAX_REQUESTS   requests served before a worker is recycled
+    GUNICORN_TIMEOUT        seconds before a silent worker is killed
+    PORT                    port to listen on
+
+The uvicorn worker class serves ``core.asgi`` and needs ``uvicorn`` installed;
+the other classes serve ``core.wsgi``.
+"""
+import importlib.util
+import os
+
+
+def env_int(name: str, default: int) -> int:
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+def available_cpus() -> int:
+    # honours CPU affinity limits, e.g. inside containers
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+WORKER_CLASSES = {
+    "sync": ("sync", "core.wsgi:application"),
+    "gthread": ("gthread", "core.wsgi:application"),
+    "uvicorn": ("uvicorn.workers.UvicornWorker", "core.asgi:application"),
+}
+
+kind = os.environ.get("GUNICORN_WORKER_CLASS", "gthread")
+
+if kind not in WORKER_CLASSES:
+    raise RuntimeError(
+        f"GUNICORN_WORKER_CLASS must be one of {', '.join(WORKER_CLASSES)}, got {kind!r}"
+    )
+
+if kind == "uvicorn" and importlib.util.find_spec("uvicorn") is None:
+    raise RuntimeError("GUNICORN_WORKER_CLASS=uvicorn needs uvicorn installed")
+
+worker_class, wsgi_app = WORKER_CLASSES[kind]
+
+cpus = available_cpus()
+
+# sync workers block on I/O so oversubscribe the CPUs, gthread workers
+# overlap I/O with their threads and the event loop of uvicorn workers
+# overlaps it within a single thread
+default_workers = {"sync": 2 * cpus + 1, "gthread": cpus + 1, "uvicorn": cpus}[kind]
+
+workers = env_int("WEB_CONCURRENCY", default_workers)
+
+threads = env_int("GUNICORN_THREADS", 4) if kind == "gthread" else 1
+
+bind = f"0.0.0.0:{env_int('PORT', 8000)}"
+
+# import the app once in the master so workers fork with it loaded
+preload_app = True
+
+# recycle workers periodically to bound memory growth, jittered so
+# they do not all restart at once
+max_requests = env_int("GUNICORN_MAX_REQUESTS", 1000)
+
+max_requests_jitter = max(max_requests // 10, 1) if max_requests else 0
+
+timeout = env_int("GUNICORN_TIMEOUT", 30)
+
+graceful_timeout = timeout
+
+keepalive = 5
+
+accesslog = "-"
+
+errorlog = "-"
@@ -0,0 +1,179 @@
+"""
+Benchmarks gunicorn worker configurations on the books endpoints.
+
+Seeds a throwaway database, starts gunicorn with gunicorn.conf.py once per
+worker class, each with a cache of its own next to the database, and reports
+throughput and latency percentiles for each:
+
+    python scripts/benchmark_gunicorn.py --configs sync gthread uvicorn
+
+Worker counts follow gunicorn.conf.py unless --workers or --threads is given.
+"""
+import argparse
+import http.client
+import importlib.util
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+PATHS = [
+    "/api/v1/books/?author_id={author_id}",
+    "/api/v1/book/{book_id}/",
+    "/api/v1/book/isbn/9780132350884/",
+    "/api/v1/authors/?ordering=-book_count&min_books=20",
+]
+
+
+def seed_database(path: str, authors: int, books: int) -> None:
+    sys.path.insert(0, str(BASE_DIR))
+    os.environ["DATABASE_PATH"] = path
+    os.environ["CACHE_LOCATION"] = os.path.join(os.path.dirname(path), "cache")
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+
+    import django
+    from django.core.management import call_command
+
+    django.setup()
+    call_command("migrate", verbosity=0)
+
+    from books.models import Author, Book
+
+    Author.objects.bulk_create(
+        Author(first_name=f"First {index}", last_name=f"Last {index}") for index in range(authors)
+    )
+    author_ids = list(Author.objects.values_list("id", flat=True))
+    Book.objects.bulk_create(
+        Book(name=f"Book {index}", isbn="9780132350884", author_id=author_ids[index % authors])
+        for index in range(books)
+    )
+    call_command("recount_authors", stdout=open(os.devnull, "w"))
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_ready(port: int, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            connection.request("GET", "/readyz")
+            connection.getresponse().read()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"gunicorn did not start on port {port}")
+
+
+def run_load(port: int, paths: list, requests: int, concurrency: int) -> dict:
+    per_client = requests // concurrency
+
+    def client(offset: int) -> tuple:
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        latencies, errors = [], 0
+
+        for index in range(per_client):
+            start = time.perf_counter()
+            try:
+                connection.request("GET", paths[(offset + index) % len(paths)])
+                response = connection.getresponse()
+                response.read()
+                errors += response.status != 200
+            except (OSError, http.client.HTTPException):
+                errors += 1
+                connection.close()
+                connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+            latencies.append(time.perf_counter() - start)
+        return latencies, errors
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(client, range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency for result in results for latency in result[0])
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50": quantiles[49] * 1000,
+        "p95": quantiles[94] * 1000,
+        "p99": quantiles[98] * 1000,
+        "errors": sum(result[1] for result in results),
+    }
+
+
+def benchmark(kind: str, args, database: str, paths: list) -> dict:
+    port = free_port()
+    # every config starts from a cold cache of its own, never the shared default
+    cache = os.path.join(os.path.dirname(database), f"cache-{kind}")
+    env = dict(
+        os.environ, GUNICORN_WORKER_CLASS=kind, PORT=str(port),
+        DATABASE_PATH=database, CACHE_LOCATION=cache,
+    )
+    if args.workers:
+        env["WEB_CONCURRENCY"] = str(args.workers)
+    if args.threads:
+        env["GUNICORN_THREADS"] = str(args.threads)
+
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "--access-logfile", os.devnull],
+        cwd=BASE_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_until_ready(port)
+        run_load(port, paths, min(args.requests, 200), args.concurrency)  # warm up
+        return run_load(port, paths, args.requests, args.concurrency)
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--configs", nargs="+", default=["sync", "gthread", "uvicorn"])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--threads", type=int)
+    parser.add_argument("--authors", type=int, default=50)
+    parser.add_argument("--books", type=int, default=1000)
+    args = parser.parse_args()
+
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+
+    with tempfile.TemporaryDirectory() as directory:
+        database = os.path.join(directory, "db.sqlite3")
+        seed_database(database, args.authors, args.books)
+        paths = [
+            PATHS[index % len(PATHS)].format(
+                author_id=index % args.authors + 1, book_id=index % args.books + 1
+            )
+            for index in range(len(PATHS) * 10)
+        ]
+
+        print(f"{'config':<10}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}")
+        for kind in args.configs:
+            if kind == "uvicorn" and importlib.util.find_spec("uvicorn") is None:
+                print(f"{kind:<10}  skipped, uvicorn is not installed")
+                continue
+
+            result = benchmark(kind, args, database, paths)
+            print(
+                f"{kind:<10}{result['rps']:>10.1f}{result['p50']:>10.1f}"
+                f"{result['p95']:>10.1f}{result['p99']:>10.1f}{result['errors']:>8}"
+            )
+
+
+if __name__ == "__main__":
+    main()